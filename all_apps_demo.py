@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 
-import subprocess
-import sys
 import json
 import os
+from fleet_runner import run_fleet
+from rl.episode_store import EpisodeStore
 
 def run_all_apps_demo():
     """Demo all supported app types"""
@@ -27,16 +27,15 @@ def run_all_apps_demo():
     print(f"Testing {len(apps)} different app types...")
     print()
     
+    # Run every app whose spec exists in-process on one worker pool
+    available = {name: spec for name, spec in apps.items() if os.path.exists(spec)}
+    app_results = dict(zip(available, run_fleet(list(available.values()), store=EpisodeStore())))
+    
     for app_name, spec_file in apps.items():
-        if os.path.exists(spec_file):
+        if app_name in app_results:
             print(f"Testing {app_name}...")
             
-            # Run RL demo for this app
-            result = subprocess.run([
-                sys.executable, "run_universal_demo.py", spec_file
-            ], capture_output=True, text=True)
-            
-            if result.returncode == 0:
+            if app_results[app_name]['status'] == "PASS":
                 print(f"✅ {app_name}: SUCCESS")
                 results[app_name] = "PASS"
             else:
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import random
+import re
+import sys
+import time
+from rl.app_state_mapper import AppStateMapper
+
+SEVERITIES = ["low", "medium", "high", "critical"]
+
+def build_spec(pattern_count):
+    """Build a synthetic app spec with the given number of error patterns"""
+    return {
+        "name": f"bench-{pattern_count}",
+        "error_patterns": [
+            {
+                "pattern": f"ERROR.*code{i:04d}",
+                "severity": SEVERITIES[i % len(SEVERITIES)],
+                "description": f"Synthetic pattern {i}"
+            }
+            for i in range(pattern_count)
+        ]
+    }
+
+def build_logs(pattern_count, line_count, error_ratio=0.05):
+    """Generate log lines where error_ratio of them hit one of the patterns"""
+    rng = random.Random(42)
+    lines = []
+    for i in range(line_count):
+        if rng.random() < error_ratio:
+            lines.append(f"ERROR: request {i} failed with code{rng.randrange(pattern_count):04d} env: prod")
+        else:
+            lines.append(f"INFO: Processing request /api/users/{i} in 12ms")
+    return lines
+
+def legacy_extract(error_patterns, log_lines):
+    """Original per-pattern re.search loop, kept for comparison"""
+    error_count = 0
+    for line in log_lines:
+        for pattern, severity in error_patterns.items():
+            if re.search(pattern, line, re.IGNORECASE):
+                error_count += 1
+        re.search(r'env[ironment]*[:\s]*(\w+)', line, re.IGNORECASE)
+    return error_count
+
+# Specs the combined matcher must count exactly like the legacy loop:
+# (error_patterns, log_lines)
+EQUIVALENCE_CASES = [
+    # Overlapping patterns across severities, several hits per line
+    ([{"pattern": "error", "severity": "high"}, {"pattern": "err", "severity": "low"},
+      {"pattern": "timeout|refused", "severity": "medium"}, {"pattern": "ERROR.*db", "severity": "critical"}],
+     ["ERROR: db timeout", "err", "connection refused", "ok"]),
+    # A numbered backreference in a later severity group
+    ([{"pattern": "(x)", "severity": "high"}, {"pattern": r"(a)b\1", "severity": "low"}],
+     ["aba", "x"]),
+]
+
+def check_equivalence():
+    """The compiled matcher must agree with the legacy loop on tricky specs"""
+    for error_patterns, log_lines in EQUIVALENCE_CASES:
+        mapper = AppStateMapper({"name": "equivalence", "error_patterns": error_patterns})
+        expected = legacy_extract(mapper.error_patterns, log_lines)
+        actual = mapper.extract_state_from_logs(log_lines)["error_count"]
+        if expected != actual:
+            print(f"MISMATCH for {[p['pattern'] for p in error_patterns]}: {expected} != {actual}")
+            return False
+    return True
+
+def lines_per_second(func, line_count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return line_count / elapsed if elapsed else float('inf')
+
+def run_benchmark(pattern_counts=(10, 100, 1000), line_count=5000, error_ratios=(0.05, 1.0)):
+    if not check_equivalence():
+        return False
+
+    print("STATE MAPPER BENCHMARK - lines/sec")
+    print("=" * 66)
+    print(f"{'patterns':>10} {'errors':>10} {'legacy':>14} {'compiled':>14} {'speedup':>10}")
+
+    for pattern_count in pattern_counts:
+        mapper = AppStateMapper(build_spec(pattern_count))
+        # 5% errors is a normal day; 100% is an error storm, where every
+        # line hits and the matcher has to count patterns, not just reject
+        for error_ratio in error_ratios:
+            logs = build_logs(pattern_count, line_count, error_ratio)
+            # The legacy loop thrashes the re module cache past 512 patterns,
+            # so it is timed on a smaller slice of the same logs
+            legacy_logs = logs[:max(20, 20000 // pattern_count)]
+
+            # Both paths must agree before timing them
+            expected = legacy_extract(mapper.error_patterns, legacy_logs)
+            actual = mapper.extract_state_from_logs(legacy_logs)["error_count"]
+            if expected != actual:
+                print(f"MISMATCH at {pattern_count} patterns, {error_ratio:.0%} errors: {expected} != {actual}")
+                return False
+
+            legacy = lines_per_second(lambda: legacy_extract(mapper.error_patterns, legacy_logs), len(legacy_logs))
+            compiled = lines_per_second(lambda: mapper.extract_state_from_logs(logs), line_count)
+            print(f"{pattern_count:>10} {error_ratio:>10.0%} {legacy:>14,.0f} {compiled:>14,.0f} {compiled / legacy:>9.1f}x")
+
+    return True
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    success = run_benchmark(counts)
+    sys.exit(0 if success else 1)
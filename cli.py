@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Universal RL CLI - One entry point for the demo, fleet, scanner, dashboards and training
+
+    python cli.py demo [spec]                 run one demo episode
+    python cli.py fleet [spec_dir]            run every app spec in-process
+    python cli.py scan <repo> [<repo> ...]    generate app specs
+    python cli.py dashboard [name]            serve a dashboard
+    python cli.py train <spec>                train a policy and save it
+    python cli.py selfcheck                   check the import-time budget
+
+Heavy dependencies (numpy, pandas, streamlit, plotly) are imported only by
+the subcommands that need them, so cron jobs and hooks that call the light
+subcommands start in a few tens of milliseconds.
+"""
+
+import argparse
+import os
+import sys
+
+HEAVY_MODULES = ('numpy', 'pandas', 'streamlit', 'plotly')
+
+HTTP_DASHBOARDS = {
+    'advanced': ('dashboard', 'start_advanced_server'),
+    'simple': ('simple_dashboard', 'start_server'),
+    'unified': ('unified_dashboard', 'start_unified_server')
+}
+STREAMLIT_DASHBOARDS = {
+    'universal': 'universal_dashboard.py',
+    'enhanced': 'enhanced_dashboard.py'
+}
+
+# Subcommands that must start without heavy dependencies: the modules they
+# import and the seconds that may take in a fresh interpreter. Budgets sit
+# well above typical times (~5ms, ~10ms, ~100ms) so a busy host does not
+# fail the check; importing numpy alone costs more than the light budgets.
+LIGHT_ENTRY_POINTS = {
+    'cli': (['cli'], 0.1),
+    'scan': (['spec.generate_app_spec'], 0.1),
+    # http.server alone takes ~40ms to import
+    'dashboard': ([module for module, _ in HTTP_DASHBOARDS.values()], 0.4)
+}
+SELFCHECK_RUNS = 5
+
+
+def cmd_demo(args):
+    from run_universal_demo import run_demo
+    from rl.episode_store import DEFAULT_STORE_PATH
+
+    try:
+        run_demo(args.spec, step_delay=args.delay)
+    except Exception as e:
+        print(f"Demo failed: {e}")
+        return 1
+    print(f"\nResults appended to {DEFAULT_STORE_PATH}")
+    return 0
+
+
+def cmd_fleet(args):
+    import fleet_runner
+
+    report = fleet_runner.main(args.spec_dir, max_workers=args.workers, episodes=args.episodes,
+                               report_path=args.report)
+    return 0 if report['failed_apps'] == 0 else 1
+
+
+def cmd_scan(args):
+    from spec.generate_app_spec import main
+
+    return main(args.repos, output_file=args.output)
+
+
+def cmd_dashboard(args):
+    if args.name in STREAMLIT_DASHBOARDS:
+        # Streamlit apps only run under Streamlit's own runner
+        import subprocess
+        return subprocess.run([sys.executable, "-m", "streamlit", "run", STREAMLIT_DASHBOARDS[args.name]]).returncode
+
+    import importlib
+    module_name, function_name = HTTP_DASHBOARDS[args.name]
+    getattr(importlib.import_module(module_name), function_name)()
+    return 0
+
+
+def cmd_train(args):
+    from universal_rl_agent import UniversalRLAgent
+    from run_universal_demo import run_episode
+
+    agent = UniversalRLAgent(args.spec, replay_capacity=args.replay)
+    total_reward = 0
+    for _ in range(args.episodes):
+        total_reward += sum(r['reward'] for r in run_episode(agent))
+        agent.train_batch(args.batch_size, args.batches)
+
+    policy_path = args.policy or f"{agent.app_spec['name']}.policy"
+    agent.save_policy(policy_path)
+    print(f"Trained {agent.app_spec['name']} for {args.episodes} episodes")
+    print(f"Total reward: {total_reward}, Q-table entries: {agent.q_table.visited_states}")
+    print(f"Policy saved to {policy_path}")
+    return 0
+
+
+def measure_import(modules, runs=SELFCHECK_RUNS):
+    """
+    (median seconds, heavy modules loaded) for importing modules in a fresh
+    interpreter, over several runs so one slow start does not decide
+    """
+    import json
+    import statistics
+    import subprocess
+
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {list(modules)!r}:\n"
+        "    __import__(name)\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps([elapsed, [m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]]))\n"
+    )
+    times, heavy = [], set()
+    for _ in range(max(1, runs)):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+        elapsed, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(elapsed)
+        heavy.update(loaded)
+    return statistics.median(times), sorted(heavy)
+
+
+def cmd_selfcheck(args):
+    """Import each light entry point cold and check it stays fast and lean"""
+    failures = 0
+    for name, (modules, budget) in LIGHT_ENTRY_POINTS.items():
+        budget = args.budget or budget
+        try:
+            elapsed, heavy = measure_import(modules, args.runs)
+        except RuntimeError as e:
+            print(f"FAIL {name}: {e}")
+            failures += 1
+            continue
+
+        problems = []
+        if heavy:
+            problems.append(f"imports {', '.join(heavy)}")
+        if elapsed > budget:
+            problems.append(f"over the {budget * 1000:.0f}ms budget")
+        status = "FAIL" if problems else "PASS"
+        print(f"{status} {name}: {elapsed * 1000:.1f}ms" + (f" ({'; '.join(problems)})" if problems else ""))
+        failures += bool(problems)
+
+    return 1 if failures else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Universal RL command line")
+    subcommands = parser.add_subparsers(dest="command", metavar="command")
+    subcommands.required = True
+
+    demo = subcommands.add_parser("demo", help="run one demo episode for an app spec")
+    demo.add_argument("spec", nargs="?", default="spec/example_app_spec.json")
+    demo.add_argument("--delay", type=float, default=1, help="seconds between steps (default 1)")
+    demo.set_defaults(func=cmd_demo)
+
+    fleet = subcommands.add_parser("fleet", help="run every app spec in one process")
+    fleet.add_argument("spec_dir", nargs="?", default="spec")
+    fleet.add_argument("--episodes", type=int, default=1)
+    fleet.add_argument("--workers", type=int, default=None)
+    fleet.add_argument("--report", default="reports/fleet_results.json")
+    fleet.set_defaults(func=cmd_fleet)
+
+    scan = subcommands.add_parser("scan", help="generate app specs from repos")
+    scan.add_argument("repos", nargs="+")
+    scan.add_argument("--output", default="app_spec.generated.json",
+                      help="spec file for a single repo (several repos go to spec/)")
+    scan.set_defaults(func=cmd_scan)
+
+    dashboard = subcommands.add_parser("dashboard", help="serve a dashboard")
+    dashboard.add_argument("name", nargs="?", default="advanced",
+                           choices=list(HTTP_DASHBOARDS) + list(STREAMLIT_DASHBOARDS))
+    dashboard.set_defaults(func=cmd_dashboard)
+
+    train = subcommands.add_parser("train", help="train a policy with experience replay and save it")
+    train.add_argument("spec")
+    train.add_argument("--episodes", type=int, default=100)
+    train.add_argument("--replay", type=int, default=10000, help="replay buffer capacity")
+    train.add_argument("--batch-size", type=int, default=256)
+    train.add_argument("--batches", type=int, default=1, help="replayed minibatches per episode")
+    train.add_argument("--policy", default=None, help="output path (default <app name>.policy; .json for JSON)")
+    train.set_defaults(func=cmd_train)
+
+    selfcheck = subcommands.add_parser("selfcheck", help="check cold-start import time of the light subcommands")
+    selfcheck.add_argument("--budget", type=float, default=None,
+                           help="seconds allowed per entry point (overrides the defaults)")
+    selfcheck.add_argument("--runs", type=int, default=SELFCHECK_RUNS,
+                           help=f"imports timed per entry point; the median counts (default {SELFCHECK_RUNS})")
+    selfcheck.set_defaults(func=cmd_selfcheck)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
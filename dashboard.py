@@ -1,36 +1,44 @@
 import json
 import os
-import subprocess
-import sys
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from rl.episode_store import store_input_paths, load_demo_results
+from dashboard_server import DashboardServer, LIVE_FEED_SCRIPT, fleet_handler
 import webbrowser
-import threading
 from datetime import datetime
+from dashboard_cache import RenderCache, send_page
+from dashboard_api import AppRegistry, APP_LIST_SCRIPT, DEFAULT_SPEC_DIR, EXTRA_SPECS
+from job_queue import JobQueue
+
+# App cards load from /api/apps
+APP_REGISTRY = AppRegistry()
+
+RESULT_FILES = store_input_paths() + ['reports/demo_results.json', 'reports/multi_app_results.json']
+
+# Everything create_advanced_html() reads; the spec directory's mtime covers
+# added or removed specs and '.' covers the Python file count
+DASHBOARD_INPUTS = [DEFAULT_SPEC_DIR] + list(EXTRA_SPECS) + RESULT_FILES + ['.']
+
+def run_demo_for_app(name):
+    """Run one demo episode for a registered app in-process; raises if it fails"""
+    from fleet_runner import run_live_demo
+    
+    spec_file = APP_REGISTRY.spec_path(name)
+    if not spec_file:
+        raise ValueError(f"No app spec for {name}")
+    return run_live_demo(spec_file)
 
 def load_all_data():
     data = {
-        'apps': {},
+        'apps': [],
         'results': None,
         'multi_results': None,
         'system_stats': {}
     }
     
-    # Load all app specs
-    specs = {
-        'flask-backend': 'spec/example_app_spec.json',
-        'coinx-backend': 'app_spec.generated.json', 
-        'coinx-frontend': 'spec/frontend_app_spec.json'
-    }
-    
-    for key, path in specs.items():
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                data['apps'][key] = json.load(f)
+    # Summaries only; the page fetches details lazily
+    data['apps'] = APP_REGISTRY.page_apps()
     
     # Load results
-    if os.path.exists('reports/demo_results.json'):
-        with open('reports/demo_results.json', 'r') as f:
-            data['results'] = json.load(f)
+    data['results'] = load_demo_results()
     
     if os.path.exists('reports/multi_app_results.json'):
         with open('reports/multi_app_results.json', 'r') as f:
@@ -448,6 +456,41 @@ def create_advanced_html():
                 </div>
             </div>
             
+            <div class="results-section">
+                <h2>📡 Live Agent Feed <span class="status-indicator status-active" data-live="connection">⚪ Connecting...</span></h2>
+                <div class="stats-grid" style="margin-top: 20px;">
+                    <div class="stat-card">
+                        <div class="stat-value" data-live="app">-</div>
+                        <div class="stat-label">Current App</div>
+                    </div>
+                    <div class="stat-card">
+                        <div class="stat-value" data-live="status">-</div>
+                        <div class="stat-label">Current State</div>
+                    </div>
+                    <div class="stat-card">
+                        <div class="stat-value" data-live="action">-</div>
+                        <div class="stat-label">Last Action</div>
+                    </div>
+                    <div class="stat-card">
+                        <div class="stat-value" data-live="total-reward">0</div>
+                        <div class="stat-label">Live Reward (<span data-live="steps">0</span> steps)</div>
+                    </div>
+                </div>
+                <table class="results-table">
+                    <thead>
+                        <tr>
+                            <th>Time</th>
+                            <th>App</th>
+                            <th>Status</th>
+                            <th>Action</th>
+                            <th>Reward</th>
+                            <th>Performance</th>
+                        </tr>
+                    </thead>
+                    <tbody data-live-log="20"></tbody>
+                </table>
+            </div>
+            
             <div class="results-section">
                 <h2>🎯 System Status</h2>
                 <div style="display: flex; align-items: center; gap: 15px; margin-top: 20px;">
@@ -465,61 +508,10 @@ def create_advanced_html():
         </div>
         
         <div id="applications" class="tab-content">
-            <div class="apps-grid">
-"""
-    
-    for app_key, app_spec in data['apps'].items():
-        # All apps show as active
-        is_active = True
-        status_class = "status-active"
-        status_text = "🟢 Active"
-        
-        html += f"""
-                <div class="app-card">
-                    <div class="app-header">
-                        <div class="app-title">{app_spec['name']}</div>
-                        <div class="app-type type-{app_spec['type']}">{app_spec['type']}</div>
-                    </div>
-                    
-                    <div class="app-details">
-                        <div class="detail-item">
-                            <div class="detail-label">Port</div>
-                            <div class="detail-value">{app_spec['port']}</div>
-                        </div>
-                        <div class="detail-item">
-                            <div class="detail-label">Actions</div>
-                            <div class="detail-value">{len(app_spec['available_actions'])}</div>
-                        </div>
-                        <div class="detail-item">
-                            <div class="detail-label">Status</div>
-                            <div class="detail-value">
-                                <span class="{status_class}">{status_text}</span>
-                            </div>
-                        </div>
-                        <div class="detail-item">
-                            <div class="detail-label">Version</div>
-                            <div class="detail-value">{app_spec['version']}</div>
-                        </div>
-                    </div>
-                    
-                    <div style="margin: 15px 0;">
-                        <div class="detail-label">Start Command</div>
-                        <code style="background: #f8f9fa; padding: 8px; border-radius: 5px; font-size: 0.9em; display: block; margin-top: 5px;">{app_spec['start_command']}</code>
-                    </div>
-                    
-                    <div class="action-buttons">
-                        <button class="btn btn-primary" onclick="runDemo('{app_key}')">
-                            🚀 Run RL Demo
-                        </button>
-                        <button class="btn btn-secondary" onclick="viewDetails('{app_key}')">
-                            📋 View Details
-                        </button>
-                    </div>
-                </div>
+            <div class="apps-grid" data-app-list data-app-render="renderAppCard"></div>
 """
     
     html += """
-            </div>
         </div>
         
         <div id="analytics" class="tab-content">
@@ -650,11 +642,71 @@ def create_advanced_html():
             }, 3000);
         }
         
+        function renderAppCard(app) {
+            var name = escapeHtml(app.name);
+            var detail = function (label, value) {
+                return '<div class="detail-item"><div class="detail-label">' + label + '</div>' +
+                       '<div class="detail-value">' + value + '</div></div>';
+            };
+            var status = app.status === 'active'
+                ? '<span class="status-active">🟢 Active</span>'
+                : '<span class="status-inactive">⚪ Inactive</span>';
+            return '<div class="app-card">' +
+                '<div class="app-header">' +
+                '<div class="app-title">' + name + '</div>' +
+                '<div class="app-type type-' + escapeHtml(app.type) + '">' + escapeHtml(app.type) + '</div>' +
+                '</div>' +
+                '<div class="app-details">' +
+                detail('Port', escapeHtml(app.port)) +
+                detail('Actions', escapeHtml(app.actions)) +
+                detail('Status', status) +
+                detail('Version', escapeHtml(app.version)) +
+                '</div>' +
+                '<div style="margin: 15px 0;">' +
+                '<div class="detail-label">Start Command</div>' +
+                '<code style="background: #f8f9fa; padding: 8px; border-radius: 5px; font-size: 0.9em; display: block; margin-top: 5px;">' +
+                escapeHtml(app.start_command) + '</code>' +
+                '</div>' +
+                '<div class="action-buttons">' +
+                '<button class="btn btn-primary" data-app="' + name + '" onclick="runDemo(this.dataset.app)">🚀 Run RL Demo</button>' +
+                '<button class="btn btn-secondary" data-app="' + name + '" onclick="viewDetails(this.dataset.app)">📋 View Details</button>' +
+                '</div>' +
+                '</div>';
+        }
+        
+        function pollJob(job) {
+            fetch('/api/jobs/' + job.id + '/result').then(function (response) {
+                return response.json();
+            }).then(function (job) {
+                if (job.status === 'queued' || job.status === 'running') {
+                    setTimeout(function () { pollJob(job); }, 1000);
+                } else if (job.status === 'done') {
+                    showNotification('✅ ' + job.key + ' demo finished: ' + job.result.total_steps +
+                                     ' steps, reward ' + job.result.total_reward);
+                } else {
+                    showNotification('❌ ' + job.key + ' demo failed: ' + job.error);
+                }
+            });
+        }
+        
         function runDemo(appKey) {
-            showNotification('Running RL demo for ' + appKey + '...');
-            setTimeout(() => {
-                location.reload();
-            }, 2000);
+            // Runs in the background; decisions appear in the live feed
+            fetch('/api/jobs', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({app: appKey})
+            }).then(function (response) {
+                return response.json();
+            }).then(function (job) {
+                if (job.error && !job.id) {
+                    showNotification('❌ ' + job.error);
+                } else {
+                    showNotification('Running RL demo for ' + appKey + '... decisions appear in the live feed');
+                    pollJob(job);
+                }
+            }).catch(function () {
+                showNotification('❌ Could not reach the dashboard');
+            });
         }
         
         function viewDetails(appKey) {
@@ -663,9 +715,6 @@ def create_advanced_html():
         
         function runFullTest() {
             showNotification('Running complete system test...');
-            setTimeout(() => {
-                location.reload();
-            }, 3000);
         }
         
         function generateSpecs() {
@@ -682,12 +731,8 @@ def create_advanced_html():
         function exportData() {
             showNotification('Exporting system data...');
         }
-        
-        // Auto-refresh every 30 seconds
-        setInterval(() => {
-            location.reload();
-        }, 30000);
     </script>
+""" + LIVE_FEED_SCRIPT + APP_LIST_SCRIPT + """
 </body>
 </html>
 """
@@ -695,21 +740,28 @@ def create_advanced_html():
     return html
 
 def start_advanced_server():
-    class Handler(SimpleHTTPRequestHandler):
+    # Re-rendered only when a spec or report changes
+    page_cache = RenderCache(create_advanced_html, DASHBOARD_INPUTS)
+    # Demo runs happen off the request threads
+    jobs = JobQueue(run_demo_for_app)
+    
+    class Handler(fleet_handler(APP_REGISTRY, jobs, accept_job=APP_REGISTRY.spec_path)):
         def do_GET(self):
             if self.path == '/' or self.path == '/dashboard':
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html')
-                self.end_headers()
-                html_content = create_advanced_html()
-                self.wfile.write(html_content.encode())
+                send_page(self, page_cache.get())
             else:
                 super().do_GET()
+        
+        def do_HEAD(self):
+            if self.path == '/' or self.path == '/dashboard':
+                send_page(self, page_cache.get(), head_only=True)
+            else:
+                super().do_HEAD()
     
     import os
     port = int(os.environ.get('PORT', 9000))
     host = '0.0.0.0'
-    server = HTTPServer((host, port), Handler)
+    server = DashboardServer((host, port), Handler)
     print(f"Dashboard running on {host}:{port}")
     print("Ready to accept connections")
     
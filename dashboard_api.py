@@ -0,0 +1,396 @@
+"""
+Dashboard API - Paginated JSON views of the app fleet for the dashboards
+
+Routes:
+    /api/apps                   registered apps, sorted by name
+    /api/apps/<name>/episodes   recorded episodes of one app, newest first
+    /api/summary                fleet-wide counts
+
+List routes take limit (default 50, at most 500), cursor (the next_cursor
+of the previous page) and fields (comma-separated projection). /api/apps
+also filters by type and status, each a comma-separated list.
+"""
+
+import base64
+import bisect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs, unquote
+from dashboard_cache import file_signature
+from rl.episode_store import shared_store
+
+DEFAULT_SPEC_DIR = 'spec'
+EXTRA_SPECS = ('app_spec.generated.json',)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EPISODE_CACHE_SIZE = 64
+REFRESH_INTERVAL = 1.0   # seconds between checks of the spec files
+
+APP_FIELDS = ('name', 'type', 'port', 'version', 'actions', 'start_command', 'spec', 'status', 'steps')
+EPISODE_FIELDS = ('episode', 'start', 'end', 'steps', 'total_reward', 'actions_taken',
+                  'successful_actions', 'final_status', 'q_table_size')
+
+# Client side of /api/apps: fills [data-app-list] containers page by page as
+# they scroll into view. data-app-render names a global function turning one
+# app into HTML; data-app-filter is an optional extra query string.
+APP_LIST_SCRIPT = """
+    <script>
+        (function () {
+            window.escapeHtml = function (value) {
+                return String(value == null ? '' : value).replace(/[&<>"']/g, function (c) {
+                    return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+                });
+            };
+
+            document.querySelectorAll('[data-app-list]').forEach(function (list) {
+                var render = window[list.getAttribute('data-app-render')];
+                var pageSize = list.getAttribute('data-page-size') || 50;
+                var filter = list.getAttribute('data-app-filter');
+                var cursor = null, loading = false, observer = null;
+
+                var sentinel = document.createElement('button');
+                sentinel.textContent = 'Load more';
+                sentinel.style.display = 'block';
+                sentinel.style.margin = '10px auto';
+                var anchor = list.closest('table') || list;
+                anchor.parentNode.insertBefore(sentinel, anchor.nextSibling);
+
+                function loadMore() {
+                    if (loading) return;
+                    loading = true;
+                    var url = '/api/apps?limit=' + pageSize + (filter ? '&' + filter : '') +
+                              (cursor ? '&cursor=' + encodeURIComponent(cursor) : '');
+                    fetch(url).then(function (response) {
+                        return response.json();
+                    }).then(function (page) {
+                        list.insertAdjacentHTML('beforeend', page.items.map(render).join(''));
+                        cursor = page.next_cursor;
+                        loading = false;
+                        if (!cursor) {
+                            if (observer) observer.disconnect();
+                            sentinel.remove();
+                        } else if (observer) {
+                            // Re-observing reports the sentinel again if it is still in view
+                            observer.unobserve(sentinel);
+                            observer.observe(sentinel);
+                        }
+                    }).catch(function () {
+                        loading = false;
+                    });
+                }
+
+                sentinel.onclick = loadMore;
+                if (window.IntersectionObserver) {
+                    observer = new IntersectionObserver(function (entries) {
+                        if (entries.some(function (entry) { return entry.isIntersecting; })) loadMore();
+                    }, {rootMargin: '600px'});
+                    observer.observe(sentinel);
+                } else {
+                    loadMore();
+                }
+            });
+        })();
+    </script>
+"""
+
+
+class ApiError(Exception):
+    """Bad API request, answered with its HTTP status and message"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def encode_cursor(position):
+    """Opaque cursor for a sort position (a tuple of JSON values)"""
+    text = json.dumps(list(position), separators=(',', ':'))
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Sort position of a cursor made by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ApiError("Invalid cursor")
+    if not isinstance(position, list):
+        raise ApiError("Invalid cursor")
+    return tuple(position)
+
+
+def paginate(items, sort_keys, cursor, limit):
+    """
+    Keyset pagination: items come sorted by sort_keys, and a page starts
+    right after the cursor's position, so pages stay consistent while items
+    are added. Returns (page, next_cursor).
+    """
+    start = 0
+    if cursor:
+        try:
+            start = bisect.bisect_right(sort_keys, decode_cursor(cursor))
+        except TypeError:
+            raise ApiError("Invalid cursor")
+    end = start + limit
+    next_cursor = encode_cursor(sort_keys[end - 1]) if end < len(items) else None
+    return items[start:end], next_cursor
+
+
+def parse_limit(query):
+    try:
+        limit = int(query.get('limit', [DEFAULT_PAGE_SIZE])[0])
+    except ValueError:
+        raise ApiError("limit must be an integer")
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def parse_list(query, name):
+    """Comma-separated values of a query parameter, None if absent"""
+    if name not in query:
+        return None
+    return [value for part in query[name] for value in part.split(',') if value]
+
+
+def parse_fields(query, allowed):
+    fields = parse_list(query, 'fields')
+    if not fields:
+        return allowed
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def project(item, fields):
+    return {field: item[field] for field in fields}
+
+
+def episode_summaries(records):
+    """One summary per episode in a stream of store records, in first-seen order"""
+    episodes = OrderedDict()
+    for r in records:
+        summary = episodes.get(r['episode'])
+        if summary is None:
+            summary = episodes[r['episode']] = {
+                'episode': r['episode'],
+                'start': r['time'],
+                'end': r['time'],
+                'steps': 0,
+                'total_reward': 0,
+                'actions_taken': 0,
+                'successful_actions': 0
+            }
+        summary['start'] = min(summary['start'], r['time'])
+        summary['end'] = max(summary['end'], r['time'])
+        summary['steps'] += 1
+        summary['total_reward'] += r['reward']
+        if r['action']:
+            summary['actions_taken'] += 1
+            summary['successful_actions'] += 1 if r['action_success'] else 0
+        summary['final_status'] = r['status']
+        summary['q_table_size'] = r['q_table_size']
+    return list(episodes.values())
+
+
+class AppRegistry:
+    """
+    App specs known to the dashboards: every JSON spec in spec_dir plus any
+    extra spec files that exist. Each spec is parsed once and re-read only
+    when its file changes, and the sorted app list is rebuilt only when a
+    spec or the episode store changes. Files are checked at most once per
+    refresh_interval, so bursts of page requests share one round of stat()s.
+    """
+
+    def __init__(self, spec_dir=DEFAULT_SPEC_DIR, extra_specs=EXTRA_SPECS, store=None,
+                 refresh_interval=REFRESH_INTERVAL):
+        self.spec_dir = spec_dir
+        self.extra_specs = extra_specs
+        self.store = store or shared_store()
+        self.refresh_interval = refresh_interval
+        self.apps = []
+        self.sort_keys = []
+        self.by_name = {}
+        self.app_rows = {}
+        self.signature = None
+        self._checked = None
+        self._specs = {}
+        self._lock = threading.Lock()
+
+    def spec_paths(self):
+        try:
+            with os.scandir(self.spec_dir) as entries:
+                paths = sorted(e.path for e in entries if e.name.endswith('.json') and not e.name.startswith('.'))
+        except OSError:
+            paths = []
+        paths += [path for path in self.extra_specs if os.path.exists(path) and path not in paths]
+        return paths
+
+    @staticmethod
+    def _load_spec(path):
+        """App summary of one spec file, None if it is not a valid spec"""
+        try:
+            with open(path, 'r') as f:
+                spec = json.load(f)
+            return {
+                'name': spec['name'],
+                'type': spec.get('type'),
+                'port': spec.get('port'),
+                'version': spec.get('version'),
+                'actions': len(spec.get('available_actions', [])),
+                'start_command': spec.get('start_command'),
+                'spec': path
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def refresh(self, force=False):
+        """
+        (apps sorted by name, their sort keys) as one consistent snapshot;
+        the first spec wins for a repeated name. force skips the
+        refresh_interval throttle, for callers that already know a file
+        changed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._checked is not None and now - self._checked < self.refresh_interval:
+                return self.apps, self.sort_keys
+            self._checked = now
+
+            paths = self.spec_paths()
+            signature = file_signature(paths + self.store.input_paths())
+            if signature == self.signature:
+                return self.apps, self.sort_keys
+
+            app_rows = self.store.app_rows()
+            specs, apps = {}, {}
+            for path, mtime, size in signature[:len(paths)]:
+                cached = self._specs.get(path)
+                if cached is None or cached[:2] != (mtime, size):
+                    cached = (mtime, size, self._load_spec(path))
+                specs[path] = cached
+                summary = cached[2]
+                if summary is None or summary['name'] in apps:
+                    continue
+                steps = app_rows.get(summary['name'], 0)
+                apps[summary['name']] = dict(summary, status='active' if steps else 'inactive', steps=steps)
+
+            self._specs = specs
+            self.apps = [apps[name] for name in sorted(apps)]
+            self.sort_keys = [(app['name'],) for app in self.apps]
+            self.by_name = apps
+            self.app_rows = app_rows
+            self.signature = signature
+            return self.apps, self.sort_keys
+
+    def page_apps(self):
+        """
+        App summaries for rendering a page. Pages are cached and only
+        re-rendered after an input changed, so this skips the throttle.
+        """
+        return self.refresh(force=True)[0]
+
+    def spec_path(self, name):
+        """Spec file of a registered app, None if unknown"""
+        self.refresh()
+        app = self.by_name.get(name)
+        return app['spec'] if app else None
+
+
+class DashboardAPI:
+    """JSON routes over an AppRegistry and its EpisodeStore"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or AppRegistry()
+        self._episodes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def handle(self, handler, head_only=False):
+        """Answer the handler's request if it is an API route; False if it is not"""
+        url = urlsplit(handler.path)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        query = parse_qs(url.query)
+        try:
+            if parts == ['api', 'apps']:
+                data = self.list_apps(query)
+            elif len(parts) == 4 and parts[:2] == ['api', 'apps'] and parts[3] == 'episodes':
+                data = self.list_episodes(parts[2], query)
+            elif parts == ['api', 'summary']:
+                data = self.summary()
+            else:
+                return False
+        except ApiError as e:
+            handler.send_json({"error": e.message}, e.status, head_only=head_only)
+            return True
+        handler.send_json(data, head_only=head_only)
+        return True
+
+    def list_apps(self, query):
+        apps, sort_keys = self.registry.refresh()
+        fields = parse_fields(query, APP_FIELDS)
+
+        types, statuses = parse_list(query, 'type'), parse_list(query, 'status')
+        if types is not None or statuses is not None:
+            selected = [i for i, app in enumerate(apps)
+                        if (types is None or app['type'] in types)
+                        and (statuses is None or app['status'] in statuses)]
+            apps = [apps[i] for i in selected]
+            sort_keys = [sort_keys[i] for i in selected]
+
+        items, next_cursor = paginate(apps, sort_keys, query.get('cursor', [None])[0], parse_limit(query))
+        return {
+            "items": [project(app, fields) for app in items],
+            "next_cursor": next_cursor,
+            "total": len(apps)
+        }
+
+    def _app_episodes(self, name):
+        """(episodes newest first, their sort keys), cached until the store changes"""
+        signature = self.registry.signature
+        with self._lock:
+            cached = self._episodes.get(name)
+            if cached is not None and cached[0] == signature:
+                self._episodes.move_to_end(name)
+                return cached[1], cached[2]
+
+        episodes = episode_summaries(self.registry.store.query(app=name))
+        episodes.sort(key=lambda e: (-e['start'], e['episode']))
+        sort_keys = [(-e['start'], e['episode']) for e in episodes]
+        with self._lock:
+            self._episodes[name] = (signature, episodes, sort_keys)
+            if len(self._episodes) > EPISODE_CACHE_SIZE:
+                self._episodes.popitem(last=False)
+        return episodes, sort_keys
+
+    def list_episodes(self, name, query):
+        self.registry.refresh()
+        if name not in self.registry.by_name and name not in self.registry.app_rows:
+            raise ApiError(f"Unknown app: {name}", 404)
+        fields = parse_fields(query, EPISODE_FIELDS)
+
+        episodes, sort_keys = self._app_episodes(name)
+        items, next_cursor = paginate(episodes, sort_keys, query.get('cursor', [None])[0], parse_limit(query))
+        return {
+            "app": name,
+            "items": [project(episode, fields) for episode in items],
+            "next_cursor": next_cursor,
+            "total": len(episodes)
+        }
+
+    def summary(self):
+        apps, _ = self.registry.refresh()
+        by_type, by_status = {}, {}
+        for app in apps:
+            by_type[app['type']] = by_type.get(app['type'], 0) + 1
+            by_status[app['status']] = by_status.get(app['status'], 0) + 1
+        return {
+            "apps": len(apps),
+            "by_type": by_type,
+            "by_status": by_status,
+            "recorded_apps": len(self.registry.app_rows),
+            "total_steps": sum(self.registry.app_rows.values())
+        }
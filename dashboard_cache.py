@@ -0,0 +1,127 @@
+"""
+Dashboard Cache - Pre-rendered, pre-compressed dashboard pages with ETags
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def file_signature(paths):
+    """(path, mtime_ns, size) of each input, None for missing files"""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class RenderedPage:
+    """One rendered page body with its ETag and compressed variants"""
+
+    def __init__(self, body, content_type='text/html; charset=utf-8'):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.content_type = content_type
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+        # A strong ETag must differ per content coding
+        self.variants = {None: (body, f'"{digest}"')}
+        self.variants['gzip'] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gz"')
+        if brotli is not None:
+            self.variants['br'] = (brotli.compress(body), f'"{digest}-br"')
+
+    @property
+    def etags(self):
+        return {etag for _, etag in self.variants.values()}
+
+    def choose_encoding(self, accept_encoding):
+        """Best precomputed encoding the client accepts, None for identity"""
+        accepted = {}
+        for part in (accept_encoding or '').split(','):
+            coding, _, params = part.strip().partition(';')
+            q = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    q = float(params[2:])
+                except ValueError:
+                    q = 0.0
+            accepted[coding.strip().lower()] = q
+
+        for coding in ('br', 'gzip'):
+            if coding in self.variants and accepted.get(coding, accepted.get('*', 0)) > 0:
+                return coding
+        return None
+
+
+class RenderCache:
+    """
+    Caches the output of a render function until one of its input files
+    changes. Inputs are checked with a stat() per request, so repeat polls
+    skip the disk reads and templating, and concurrent requests during a
+    change render the page only once.
+    """
+
+    def __init__(self, render, input_paths, content_type='text/html; charset=utf-8'):
+        self.render = render
+        self.input_paths = input_paths
+        self.content_type = content_type
+        self._lock = threading.Lock()
+        self._signature = None
+        self._page = None
+
+    def _paths(self):
+        return self.input_paths() if callable(self.input_paths) else self.input_paths
+
+    def invalidate(self):
+        """Force the next get() to render again"""
+        with self._lock:
+            self._signature = None
+
+    def get(self):
+        """Current RenderedPage, rendering only if an input changed"""
+        signature = file_signature(self._paths())
+        with self._lock:
+            if self._page is None or signature != self._signature:
+                self._page = RenderedPage(self.render(), self.content_type)
+                self._signature = signature
+            return self._page
+
+
+def send_page(handler, page, head_only=False):
+    """Answer a BaseHTTPRequestHandler request from a RenderedPage, with 304s"""
+    encoding = page.choose_encoding(handler.headers.get('Accept-Encoding'))
+    body, etag = page.variants[encoding]
+
+    if_none_match = handler.headers.get('If-None-Match')
+    if if_none_match:
+        tags = {tag.strip() for tag in if_none_match.split(',')}
+        if '*' in tags or tags & page.etags:
+            handler.send_response(304)
+            handler.send_header('ETag', etag)
+            handler.send_header('Cache-Control', 'no-cache')
+            handler.send_header('Vary', 'Accept-Encoding')
+            handler.end_headers()
+            return
+
+    handler.send_response(200)
+    handler.send_header('Content-Type', page.content_type)
+    handler.send_header('Content-Length', str(len(body)))
+    handler.send_header('ETag', etag)
+    handler.send_header('Cache-Control', 'no-cache')
+    handler.send_header('Vary', 'Accept-Encoding')
+    if encoding:
+        handler.send_header('Content-Encoding', encoding)
+    handler.end_headers()
+    if not head_only:
+        handler.wfile.write(body)
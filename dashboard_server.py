@@ -0,0 +1,327 @@
+"""
+Dashboard Server - Shared concurrent HTTP server core for the dashboards
+"""
+
+import json
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from rl.event_feed import EventFeed, follow_event_file, DEFAULT_EVENTS_PATH
+from dashboard_api import DashboardAPI
+
+DEFAULT_WORKERS = 64
+KEEPALIVE_TIMEOUT = 5
+SSE_PING_INTERVAL = 15
+SSE_SEND_TIMEOUT = 2
+SSE_BACKLOG = 50
+SSE_QUEUE_SIZE = 256      # batches a viewer may fall behind before it is dropped
+
+# Client side of /events: patches elements marked with data-live attributes
+LIVE_FEED_SCRIPT = """
+    <script>
+        (function () {
+            if (!window.EventSource) return;
+            var steps = 0, totalReward = 0;
+            
+            function setLive(name, value) {
+                document.querySelectorAll('[data-live="' + name + '"]').forEach(function (el) {
+                    el.textContent = value;
+                });
+            }
+            
+            var source = new EventSource('/events');
+            source.onopen = function () { setLive('connection', '🟢 Live'); };
+            source.onerror = function () { setLive('connection', '🟡 Reconnecting...'); };
+            source.addEventListener('transition', function (message) {
+                var event = JSON.parse(message.data);
+                steps += 1;
+                totalReward += event.reward;
+                
+                setLive('app', event.app);
+                setLive('status', event.state.status);
+                setLive('action', event.action || 'None');
+                setLive('reward', event.reward);
+                setLive('steps', steps);
+                setLive('total-reward', Math.round(totalReward * 100) / 100);
+                
+                document.querySelectorAll('[data-live-log]').forEach(function (body) {
+                    var row = body.insertRow(0);
+                    [
+                        new Date(event.time * 1000).toLocaleTimeString(),
+                        event.app,
+                        event.state.status,
+                        event.action || 'None',
+                        event.reward,
+                        event.state.performance_score + '%'
+                    ].forEach(function (value) {
+                        row.insertCell().textContent = value;
+                    });
+                    var limit = parseInt(body.getAttribute('data-live-log'), 10) || 20;
+                    while (body.rows.length > limit) {
+                        body.deleteRow(body.rows.length - 1);
+                    }
+                });
+            });
+        })();
+    </script>
+"""
+
+
+class DashboardRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Base handler for dashboard pages. Speaks HTTP/1.1 so browsers reuse
+    connections; idle connections are dropped after KEEPALIVE_TIMEOUT
+    seconds so they give their worker back. Every response must carry a
+    Content-Length, which send_html takes care of.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body go out in separate writes; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+
+    def send_html(self, html, status=200, head_only=False):
+        """Send a complete HTML response"""
+        body = html.encode('utf-8') if isinstance(html, str) else html
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def send_json(self, data, status=200, head_only=False):
+        """Send a complete JSON response"""
+        body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def read_json(self, max_bytes=64 << 10):
+        """Parsed JSON request body, {} when empty; ValueError if malformed or too large"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > max_bytes:
+            # The unread body would be parsed as the next request
+            self.close_connection = True
+            raise ValueError("Request body too large")
+        body = self.rfile.read(length) if length else b''
+        return json.loads(body) if body.strip() else {}
+
+    def send_event_stream(self, hub):
+        """Answer with a Server-Sent Events stream and hand the connection to hub"""
+        try:
+            last_event_id = int(self.headers.get('Last-Event-ID', 0))
+        except ValueError:
+            last_event_id = 0
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+
+        # The stream ends when either side closes; the worker is freed now
+        self.close_connection = True
+        self.server.detach(self.request)
+        hub.attach(self.request, last_event_id)
+
+
+class EventStream:
+    """
+    One attached Server-Sent Events connection. Batches of encoded events
+    are queued without blocking and written by the stream's own thread, so
+    a slow viewer only ever holds up itself. It is dropped once its send
+    timeout passes or more than SSE_QUEUE_SIZE batches pile up, and gets a
+    comment line after ping_interval idle seconds so proxies keep it open.
+    """
+
+    def __init__(self, sock, last_id, ping_interval):
+        self.sock = sock
+        self.last_id = last_id
+        self.ping_interval = ping_interval
+        self.closed = False
+        self._queue = queue.Queue(maxsize=SSE_QUEUE_SIZE)
+
+    def start(self, replay):
+        self._queue.put_nowait(replay)
+        threading.Thread(target=self._run, name="event-stream-client", daemon=True).start()
+
+    def push(self, encoded):
+        """Queue a batch of (id, bytes); False if the viewer is gone or too far behind"""
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(encoded)
+        except queue.Full:
+            self.close()
+            return False
+        return True
+
+    def _run(self):
+        first = True
+        while not self.closed:
+            try:
+                encoded = self._queue.get(timeout=self.ping_interval)
+                # Events replayed on attach can be broadcast again right after
+                payload = b''.join(data for i, data in encoded if i > self.last_id)
+                if first and not payload:
+                    payload = b': connected\n\n'
+            except queue.Empty:
+                encoded, payload = [], b': ping\n\n'
+            first = False
+            if not payload:
+                continue
+            try:
+                self.sock.sendall(payload)
+            except OSError:
+                self.close()
+                return
+            if encoded:
+                self.last_id = max(self.last_id, encoded[-1][0])
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class EventStreamHub:
+    """
+    Fans feed events out to every attached Server-Sent Events connection.
+    A single thread encodes each event once and queues it for every
+    stream; viewers do not occupy request workers, and a viewer that stops
+    reading is dropped after SSE_SEND_TIMEOUT seconds without delaying the
+    others.
+    """
+
+    def __init__(self, feed, ping_interval=SSE_PING_INTERVAL, send_timeout=SSE_SEND_TIMEOUT):
+        self.feed = feed
+        self.ping_interval = ping_interval
+        self.send_timeout = send_timeout
+        self.clients = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @staticmethod
+    def encode(event_id, event):
+        """One event in text/event-stream framing"""
+        data = json.dumps(event, separators=(',', ':'))
+        return f"id: {event_id}\nevent: {event.get('type', 'message')}\ndata: {data}\n\n".encode('utf-8')
+
+    def attach(self, sock, last_event_id=0):
+        """Start streaming to a connected socket, replaying what it missed"""
+        sock.settimeout(self.send_timeout)
+        with self._lock:
+            if last_event_id > self.feed.last_id:
+                # The feed restarted since this viewer's last event
+                last_event_id = 0
+            if last_event_id == 0:
+                last_event_id = max(0, self.feed.last_id - SSE_BACKLOG)
+
+            missed = [(i, self.encode(i, e)) for i, e in self.feed.events_after(last_event_id)]
+            client = EventStream(sock, last_event_id, self.ping_interval)
+            client.start(missed)
+            self.clients.append(client)
+
+            if self._thread is None:
+                # Broadcast from the replay snapshot, so nothing published
+                # since then is skipped
+                cursor = missed[-1][0] if missed else last_event_id
+                self._thread = threading.Thread(target=self._run, args=(cursor,),
+                                                name="event-stream", daemon=True)
+                self._thread.start()
+
+    def _run(self, cursor):
+        while True:
+            events = self.feed.events_after(cursor, timeout=self.ping_interval)
+            if not events:
+                continue
+            encoded = [(i, self.encode(i, e)) for i, e in events]
+            cursor = encoded[-1][0]
+            with self._lock:
+                self.clients = [c for c in self.clients if c.push(encoded)]
+
+
+def live_event_hub(events_path=DEFAULT_EVENTS_PATH):
+    """EventStreamHub fed by the agent event spool file"""
+    feed = EventFeed()
+    follow_event_file(feed, events_path)
+    return EventStreamHub(feed)
+
+
+def fleet_handler(registry, jobs=None, accept_job=None):
+    """
+    DashboardRequestHandler subclass answering the routes every dashboard
+    shares: the live /events stream, the /api JSON views of registry and,
+    given a JobQueue, the /api/jobs routes (accept_job vets app names).
+    Dashboards serve their pages and call super() for everything else.
+    """
+    # Agent decisions are pushed to open pages instead of polled
+    live_hub = live_event_hub()
+    api = DashboardAPI(registry)
+
+    class FleetRequestHandler(DashboardRequestHandler):
+        def do_GET(self):
+            if self.path == '/events':
+                self.send_event_stream(live_hub)
+            elif not (jobs and jobs.handle(self)) and not api.handle(self):
+                super().do_GET()
+
+        def do_POST(self):
+            if not (jobs and jobs.handle(self, accept=accept_job)):
+                self.send_json({"error": "Not found"}, 404)
+
+        def do_HEAD(self):
+            if not api.handle(self, head_only=True):
+                super().do_HEAD()
+
+    return FleetRequestHandler
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """
+    HTTP server that handles each connection on a bounded pool of worker
+    threads, so one slow client or page render no longer blocks the others
+    and a burst of viewers cannot spawn unbounded threads. Connections
+    beyond max_workers wait in the pool's queue.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, max_workers=DEFAULT_WORKERS):
+        self.max_workers = max_workers
+        self._detached = set()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard")
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def detach(self, request):
+        """Keep a connection open after its handler returns (streams)"""
+        self._detached.add(request)
+
+    def shutdown_request(self, request):
+        if request in self._detached:
+            self._detached.discard(request)
+            return
+        super().shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        """Viewers closing tabs mid-response are routine, not errors"""
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
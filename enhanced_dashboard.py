@@ -1,17 +1,16 @@
 import streamlit as st
-import json
-import os
-import pandas as pd
 import plotly.express as px
+from streamlit_cache import load_json, latest_results, results_frame
 
 def load_all_results():
+    """Latest episode and multi-app report; re-read only when their files change"""
     results = {}
-    if os.path.exists('reports/demo_results.json'):
-        with open('reports/demo_results.json', 'r') as f:
-            results['latest'] = json.load(f)
-    if os.path.exists('reports/multi_app_results.json'):
-        with open('reports/multi_app_results.json', 'r') as f:
-            results['multi_app'] = json.load(f)
+    latest = latest_results()
+    if latest:
+        results['latest'] = latest
+    multi_app = load_json('reports/multi_app_results.json')
+    if multi_app is not None:
+        results['multi_app'] = multi_app
     return results
 
 def main():
@@ -53,16 +52,8 @@ def main():
         if 'latest' in results:
             st.header("Performance Analysis")
             
-            # Create performance chart
-            chart_data = []
-            for result in results['latest']['results']:
-                chart_data.append({
-                    'Step': result['step'],
-                    'Performance': result['state']['performance_score'],
-                    'Reward': result['reward']
-                })
-            
-            df = pd.DataFrame(chart_data)
+            # Built once per recorded episode, not on every rerun
+            df = results_frame()
             
             # Performance line chart
             fig = px.line(df, x='Step', y='Performance', title='Performance Over Time')
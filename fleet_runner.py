@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Fleet Runner - Drives one UniversalRLAgent per app spec in a single process
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from universal_rl_agent import UniversalRLAgent
+from run_universal_demo import run_episode
+from rl.episode_store import EpisodeStore
+from rl.event_feed import JsonlEventSink
+from rl.shared_q_table import SharedQTable
+
+DEFAULT_REPORT = 'reports/fleet_results.json'
+
+
+def discover_specs(spec_dir='spec', extra_specs=()):
+    """All app spec JSON files under spec_dir, plus any extra specs that exist"""
+    paths = sorted(glob.glob(os.path.join(spec_dir, '*.json')))
+    for path in extra_specs:
+        if os.path.exists(path) and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def run_app(spec_path, episodes=1, store=None, shared_q_table=None, listeners=()):
+    """Run demo episodes for one app and summarize them; never raises"""
+    start = time.perf_counter()
+    try:
+        agent = UniversalRLAgent(spec_path, shared_q_table=shared_q_table)
+        for listener in listeners:
+            agent.add_listener(listener)
+        results = []
+        for _ in range(episodes):
+            episode = run_episode(agent)
+            if store is not None:
+                store.append_episode(agent.app_spec['name'], episode, agent.q_table.visited_states)
+            results.extend(episode)
+    except Exception as e:
+        return {
+            "spec": spec_path,
+            "status": "FAIL",
+            "error": str(e),
+            "duration": round(time.perf_counter() - start, 4)
+        }
+
+    actions_taken = [r for r in results if r['action']]
+    return {
+        "spec": spec_path,
+        "app_name": agent.app_spec.get('name'),
+        "app_type": agent.app_spec.get('type'),
+        "status": "PASS",
+        "total_steps": len(results),
+        "total_reward": sum(r['reward'] for r in results),
+        "successful_actions": sum(1 for r in actions_taken if r['action_success']),
+        "actions_taken": len(actions_taken),
+        "q_table_size": agent.q_table.visited_states,
+        "duration": round(time.perf_counter() - start, 4)
+    }
+
+
+def run_live_demo(spec_path):
+    """
+    One demo episode started from a dashboard: recorded in the episode store
+    and streamed to open pages through the event spool. Raises if it fails,
+    so JobQueue marks the job failed.
+    """
+    result = run_app(spec_path, store=EpisodeStore(), listeners=[JsonlEventSink()])
+    if result['status'] != "PASS":
+        raise RuntimeError(result['error'])
+    return result
+
+
+def run_fleet(spec_paths, max_workers=None, episodes=1, on_result=None, store=None, shared_q_table=None):
+    """
+    Run every app on a shared worker pool. Results come back in spec_paths
+    order; on_result, if given, is called with each one as it completes.
+    Episodes are appended to store, an EpisodeStore, when one is given.
+    With a SharedQTable, apps learn from each other's experience.
+    """
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="fleet") as pool:
+        futures = {pool.submit(run_app, path, episodes, store, shared_q_table): path for path in spec_paths}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result:
+                on_result(result)
+
+    return [results[path] for path in spec_paths]
+
+
+def build_report(app_results, duration):
+    """Aggregate per-app results into one fleet report"""
+    passed = [r for r in app_results if r['status'] == "PASS"]
+    return {
+        "total_apps": len(app_results),
+        "passed_apps": len(passed),
+        "failed_apps": len(app_results) - len(passed),
+        "total_steps": sum(r['total_steps'] for r in passed),
+        "total_reward": sum(r['total_reward'] for r in passed),
+        "duration": round(duration, 4),
+        "apps": app_results
+    }
+
+
+def save_report(report, filepath=DEFAULT_REPORT):
+    """Write a fleet report as JSON"""
+    with open(filepath, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def main(spec_dir='spec', max_workers=None, episodes=1, report_path=DEFAULT_REPORT):
+    """Run the whole fleet and save the aggregated report"""
+    spec_paths = discover_specs(spec_dir, extra_specs=['app_spec.generated.json'])
+    print(f"Running {len(spec_paths)} apps in-process...")
+
+    def show(result):
+        if result['status'] == "PASS":
+            print(f"PASS {result['app_name']}: reward {result['total_reward']}, {result['total_steps']} steps")
+        else:
+            print(f"FAIL {result['spec']}: {result['error']}")
+
+    start = time.perf_counter()
+    app_results = run_fleet(spec_paths, max_workers=max_workers, episodes=episodes, on_result=show,
+                            store=EpisodeStore(), shared_q_table=SharedQTable())
+    report = build_report(app_results, time.perf_counter() - start)
+    save_report(report, report_path)
+
+    print(f"\n{report['passed_apps']}/{report['total_apps']} apps passed in {report['duration']:.2f}s")
+    print(f"Fleet report saved to {report_path}")
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+
+    spec_dir = sys.argv[1] if len(sys.argv) > 1 else "spec"
+    episodes = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    report = main(spec_dir, episodes=episodes)
+    sys.exit(0 if report['failed_apps'] == 0 else 1)
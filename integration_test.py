@@ -2,6 +2,74 @@ import os
 import subprocess
 import sys
 
+def check_background_action():
+    """A `cmd &` action (like restart_service) returns promptly and leaves its child running"""
+    if os.name != 'posix':
+        return True
+    from rl.app_action_space import AppActionSpace
+
+    marker = f"sleep 29.{os.getpid()}"
+    action_space = AppActionSpace({"name": "background-check", "available_actions": [
+        {"name": "restart_service", "command": f"{marker} & echo started", "risk_level": "low", "timeout": 5}
+    ]})
+    try:
+        # The synchronous path, which runs on the shared async executor
+        result = action_space.execute_action("restart_service", dry_run=False)
+        child = subprocess.run(["pgrep", "-f", marker], capture_output=True).returncode == 0
+        return result["success"] and not result.get("timed_out") and child
+    except Exception:
+        return False
+    finally:
+        subprocess.run(["pkill", "-f", marker])
+
+def check_app_api():
+    """/api/apps pages through every app once, filters by type and status, and rejects bad cursors"""
+    import json
+    import tempfile
+    from dashboard_api import AppRegistry, DashboardAPI
+    from rl.episode_store import EpisodeStore
+
+    class Request:
+        def __init__(self, path):
+            self.path = path
+            self.response = None
+
+        def send_json(self, data, status=200, head_only=False):
+            self.response = (status, data)
+
+    def get(path):
+        request = Request(path)
+        api.handle(request)
+        return request.response
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in range(7):
+            with open(os.path.join(tmp, f"app{n}.json"), "w") as f:
+                json.dump({"name": f"app{n}", "type": "frontend" if n % 2 else "backend"}, f)
+        store = EpisodeStore(os.path.join(tmp, "episodes"))
+        store.append_episode("app3", [{"step": 0, "state": {}, "action": None,
+                                       "reward": 0, "action_success": False}])
+        api = DashboardAPI(AppRegistry(spec_dir=tmp, extra_specs=(), store=store))
+
+        names, cursor = [], None
+        while True:
+            status, page = get("/api/apps?limit=3&fields=name" + (f"&cursor={cursor}" if cursor else ""))
+            if status != 200 or len(page["items"]) > 3:
+                return False
+            names += [app["name"] for app in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        paged = names == [f"app{n}" for n in range(7)]
+
+        _, frontend = get("/api/apps?type=frontend&limit=2")
+        _, active = get("/api/apps?status=active&type=frontend,backend")
+        filtered = (frontend["total"] == 3 and [app["name"] for app in frontend["items"]] == ["app1", "app3"]
+                    and [app["name"] for app in active["items"]] == ["app3"])
+
+        invalid = get("/api/apps?cursor=not-a-cursor")[0] == 400 and get("/api/apps?cursor=e30")[0] == 400
+        return paged and filtered and invalid
+
 def run_integration_test():
     print("UNIVERSAL RL SYSTEM - INTEGRATION TEST")
     print("=" * 40)
@@ -24,6 +92,14 @@ def run_integration_test():
     else:
         print("SKIP")
     
+    # Test 4: Background actions
+    print("4. Testing background actions...")
+    print("PASS" if check_background_action() else "FAIL")
+    
+    # Test 5: Dashboard API
+    print("5. Testing app API pagination...")
+    print("PASS" if check_app_api() else "FAIL")
+    
     print("Integration test complete!")
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+"""
+Job Queue - Background jobs for dashboard actions, with coalescing
+
+Routes served by JobQueue.handle():
+    POST /api/jobs              {"app": key}: start a job, 202 with its status
+    GET  /api/jobs              remembered jobs, newest first
+    GET  /api/jobs/<id>         status of one job
+    GET  /api/jobs/<id>/result  status and outcome; 202 while still pending
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_HISTORY = 100
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Job:
+    """One submitted run and its outcome"""
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.status = QUEUED
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def to_dict(self, include_result=False):
+        data = {
+            "id": self.id,
+            "key": self.key,
+            "status": self.status,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on a bounded pool of worker threads so request
+    handlers return immediately. Jobs are identified by a key (e.g. the app
+    name): submitting a key that is still queued or running returns the
+    existing job instead of starting another. The newest `history` jobs
+    are kept for status and result lookups.
+    """
+
+    def __init__(self, run, max_workers=DEFAULT_JOB_WORKERS, history=DEFAULT_JOB_HISTORY):
+        self.run = run
+        self.history = history
+        self.jobs = OrderedDict()
+        self._active = {}
+        self._lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jobs")
+
+    def submit(self, key):
+        """(job, coalesced): the new job for key, or the one already pending"""
+        with self._lock:
+            job = self._active.get(key)
+            if job is not None:
+                return job, True
+
+            job = Job(key)
+            self.jobs[job.id] = job
+            self._active[key] = job
+            self._trim()
+        self.pool.submit(self._execute, job)
+        return job, False
+
+    def get(self, job_id):
+        """Job by id, or None if unknown or expired"""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        """All remembered jobs, newest first"""
+        with self._lock:
+            return list(reversed(self.jobs.values()))
+
+    def _trim(self):
+        """Forget the oldest finished jobs beyond the history limit"""
+        excess = len(self.jobs) - self.history
+        for job_id in [j.id for j in self.jobs.values() if not j.active][:max(0, excess)]:
+            del self.jobs[job_id]
+
+    def _execute(self, job):
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            result, error, status = self.run(job.key), None, DONE
+        except Exception as e:
+            result, error, status = None, str(e), FAILED
+
+        # Finish under the lock so a new submit never coalesces onto a done job
+        with self._lock:
+            job.result, job.error, job.status = result, error, status
+            job.finished = time.time()
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+
+    def handle(self, handler, accept=None):
+        """
+        Answer the handler's request if it is a job route; False if it is
+        not. accept(key), if given, rejects POSTed keys it returns falsy
+        for with a 404.
+        """
+        if handler.command == 'POST':
+            if handler.path != '/api/jobs':
+                return False
+            try:
+                key = handler.read_json().get('app')
+            except (ValueError, AttributeError):
+                handler.send_json({"error": "Expected a JSON object"}, 400)
+                return True
+            if not isinstance(key, str) or (accept is not None and not accept(key)):
+                handler.send_json({"error": f"Unknown app: {key}"}, 404)
+                return True
+
+            job, coalesced = self.submit(key)
+            data = job.to_dict()
+            data["coalesced"] = coalesced
+            handler.send_json(data, 202)
+            return True
+
+        if handler.path == '/api/jobs':
+            handler.send_json({"jobs": [job.to_dict() for job in self.list()]})
+            return True
+        if not handler.path.startswith('/api/jobs/'):
+            return False
+
+        job_id, _, tail = handler.path[len('/api/jobs/'):].partition('/')
+        job = self.get(job_id)
+        if job is None or tail not in ('', 'result'):
+            handler.send_json({"error": "Unknown job"}, 404)
+        elif tail == 'result' and job.active:
+            # Not finished yet: 202 with the current status
+            handler.send_json(job.to_dict(), 202)
+        else:
+            handler.send_json(job.to_dict(include_result=tail == 'result'))
+        return True
+
+    def shutdown(self, wait=False):
+        self.pool.shutdown(wait=wait, cancel_futures=True)
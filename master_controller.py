@@ -3,7 +3,8 @@
 import subprocess
 import sys
 import os
-import json
+from rl.episode_store import load_demo_results
+from spec.generate_app_spec import scan_repos
 
 class MasterController:
     """Master controller for the entire Universal RL ecosystem"""
@@ -36,20 +37,18 @@ class MasterController:
             (r"c:\Users\RITESH\coinX-hyperlocal\frontend", "coinx-frontend")
         ]
         
-        for app_path, app_name in apps_to_scan:
-            if os.path.exists(app_path):
-                print(f"Scanning {app_name}...")
-                result = subprocess.run([
-                    sys.executable, "spec/generate_app_spec.py", app_path
-                ], capture_output=True)
-                
-                if result.returncode == 0:
-                    # Rename generated spec
-                    if os.path.exists("app_spec.generated.json"):
-                        os.rename("app_spec.generated.json", f"spec/{app_name}_spec.json")
-                    print(f"✅ {app_name} spec generated")
-                else:
-                    print(f"❌ {app_name} spec failed")
+        # Scan every available repo in parallel, reusing cached per-file results
+        available = [(path, name) for path, name in apps_to_scan if os.path.exists(path)]
+        if not available:
+            return
+        
+        results = scan_repos([path for path, _ in available], output_dir="spec",
+                             names=[name for _, name in available])
+        for name, result in results.items():
+            if result["status"] == "PASS":
+                print(f"✅ {name} spec generated")
+            else:
+                print(f"❌ {name} spec failed")
     
     def run_complete_demo(self):
         """Run complete system demonstration"""
@@ -113,9 +112,8 @@ class MasterController:
         
         # Check results
         print("\nResults:")
-        if os.path.exists("reports/demo_results.json"):
-            with open("reports/demo_results.json", 'r') as f:
-                results = json.load(f)
+        results = load_demo_results()
+        if results:
             print(f"  ✅ Last demo: {results['app_name']} ({results['total_steps']} steps)")
         
         # Integration status
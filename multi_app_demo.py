@@ -1,6 +1,6 @@
-import subprocess
-import sys
 import json
+from fleet_runner import run_fleet
+from rl.episode_store import EpisodeStore
 
 def run_multi_app_demo():
     """Day 5 - Multi-App Demo"""
@@ -14,14 +14,12 @@ def run_multi_app_demo():
     
     results = {}
     
-    for app_name, spec_file in apps:
+    app_results = run_fleet([spec_file for _, spec_file in apps], store=EpisodeStore())
+    
+    for (app_name, spec_file), app_result in zip(apps, app_results):
         print(f"\nTesting {app_name}...")
         
-        result = subprocess.run([
-            sys.executable, "run_universal_demo.py", spec_file
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
+        if app_result['status'] == "PASS":
             print(f"SUCCESS: {app_name} managed by RL")
             results[app_name] = "PASS"
         else:
@@ -0,0 +1,223 @@
+"""
+Action Executor - Runs app actions concurrently without blocking the agent
+"""
+
+import asyncio
+import os
+import signal
+import threading
+from concurrent.futures import Future
+
+DEFAULT_ACTION_TIMEOUT = 300
+OUTPUT_DRAIN_TIMEOUT = 1.0   # seconds to keep reading output after the shell exits
+EXIT_POLL_INTERVAL = 0.05
+MAX_OUTPUT_CHARS = 64 * 1024
+
+
+class AsyncActionExecutor:
+    """
+    Executes action commands on an asyncio loop running in a background
+    thread. Submissions return concurrent.futures.Future objects, so a
+    synchronous agent can keep issuing remediations while slow ones finish.
+    Each run has a timeout, at most max_concurrency commands run at once,
+    and output is streamed line by line to an optional callback.
+    Cancelling a future kills the command.
+    """
+
+    def __init__(self, max_concurrency=4, default_timeout=DEFAULT_ACTION_TIMEOUT, on_output=None):
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.on_output = on_output
+
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = None
+        self._thread = threading.Thread(target=self._run_loop, name="action-executor", daemon=True)
+        self._started = threading.Event()
+        self._thread.start()
+        self._started.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop.call_soon(self._started.set)
+        self._loop.run_forever()
+
+    @property
+    def closed(self):
+        return self._loop.is_closed()
+
+    def submit(self, action_name, command, timeout=None):
+        """Schedule a command, returning a Future of the action result dict"""
+        if self.closed:
+            raise RuntimeError("Action executor is closed")
+        if timeout is None:
+            timeout = self.default_timeout
+        return asyncio.run_coroutine_threadsafe(self._execute(action_name, command, timeout), self._loop)
+
+    async def _open_pipe(self):
+        """(reader, read transport, write fd) of a pipe for one output stream"""
+        read_fd, write_fd = os.pipe()
+        reader = asyncio.StreamReader()
+        try:
+            transport, _ = await self._loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_fd, 'rb', 0))
+        except BaseException:
+            os.close(write_fd)
+            raise
+        return reader, transport, write_fd
+
+    async def _spawn(self, command):
+        """
+        Start the shell. On POSIX its output goes to pipes we own, so our
+        ends can be closed even while background children still hold theirs.
+        Returns (process, [(reader, transport or None)] for stdout and stderr).
+        """
+        if os.name != 'posix':
+            process = await asyncio.create_subprocess_shell(
+                command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            return process, [(process.stdout, None), (process.stderr, None)]
+
+        pipes = []
+        try:
+            pipes.append(await self._open_pipe())
+            pipes.append(await self._open_pipe())
+            process = await asyncio.create_subprocess_shell(
+                command, stdout=pipes[0][2], stderr=pipes[1][2], start_new_session=True)
+        except BaseException:
+            for _, transport, _ in pipes:
+                transport.close()
+            raise
+        finally:
+            # The shell has its own copies; ours would keep the readers from seeing EOF
+            for _, _, write_fd in pipes:
+                os.close(write_fd)
+        return process, [(reader, transport) for reader, transport, _ in pipes]
+
+    async def _execute(self, action_name, command, timeout):
+        async with self._semaphore:
+            process, streams = await self._spawn(command)
+            stdout, stderr = [], []
+            readers = asyncio.gather(
+                self._read_stream(streams[0][0], action_name, 'stdout', stdout),
+                self._read_stream(streams[1][0], action_name, 'stderr', stderr)
+            )
+
+            timed_out = False
+            try:
+                try:
+                    await asyncio.wait_for(self._wait_shell(process, readers), timeout)
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    self._kill(process)
+                    await process.wait()
+
+                # Background children (e.g. `uvicorn ... &`) inherit the pipes and keep
+                # them open after the shell exits, so stop reading shortly after it does
+                try:
+                    await asyncio.wait_for(asyncio.shield(readers), OUTPUT_DRAIN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                self._kill(process)
+                await process.wait()
+                raise
+            finally:
+                # Also retrieves the readers' exception when close() cancelled them
+                readers.cancel()
+                await asyncio.gather(readers, return_exceptions=True)
+                for _, transport in streams:
+                    if transport is not None:
+                        transport.close()
+
+            output = ''.join(stdout)
+            error = ''.join(stderr)
+            if timed_out:
+                error += f"\nTimed out after {timeout}s"
+
+            return {
+                "success": not timed_out and process.returncode == 0,
+                "action": action_name,
+                "command": command,
+                "executed": True,
+                "returncode": process.returncode,
+                "timed_out": timed_out,
+                "output": output,
+                "error": error
+            }
+
+    async def _read_stream(self, stream, action_name, stream_name, chunks):
+        """Collect a stream line by line, forwarding lines as they arrive"""
+        size = 0
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            text = line.decode('utf-8', errors='replace')
+            if self.on_output:
+                self.on_output(action_name, stream_name, text)
+            if size < MAX_OUTPUT_CHARS:
+                chunks.append(text[:MAX_OUTPUT_CHARS - size])
+                size += len(text)
+
+    @staticmethod
+    async def _wait_shell(process, readers):
+        """
+        Wait for the shell itself to exit. With asyncio's own pipes,
+        process.wait() also waits for them to close, which background
+        children started with `&` keep open.
+        """
+        while process.returncode is None and not readers.done():
+            await asyncio.wait([readers], timeout=EXIT_POLL_INTERVAL)
+        if process.returncode is None:
+            await process.wait()
+
+    def _kill(self, process):
+        """Kill a command and, on POSIX, everything its shell started"""
+        if process.returncode is not None:
+            return
+        try:
+            if os.name == 'posix':
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    def close(self):
+        """Cancel running commands and stop the loop thread"""
+        if self._loop.is_closed():
+            return
+
+        async def cancel_all():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(cancel_all(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_shared_executor = None
+_shared_lock = threading.Lock()
+
+
+def shared_executor():
+    """
+    The process-wide executor, started on first use. Every app shares its
+    loop thread, so max_concurrency bounds commands across the whole fleet.
+    """
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is None or _shared_executor.closed:
+            _shared_executor = AsyncActionExecutor()
+        return _shared_executor
+
+
+def completed_future(result):
+    """Wrap an already known action result in a Future"""
+    future = Future()
+    future.set_result(result)
+    return future
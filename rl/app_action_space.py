@@ -1,21 +1,104 @@
 import json
+from types import MappingProxyType
+import numpy as np
+from rl.app_state_mapper import STATUS_ENCODING, ENV_ENCODING
+
+# Mask table rows: each known status/env by its state encoding, then one
+# row for any other value (which the safety rules treat differently from
+# the encoding's default of 0)
+MASK_STATUSES = sorted(STATUS_ENCODING, key=STATUS_ENCODING.get) + [None]
+MASK_ENVS = sorted(ENV_ENCODING, key=ENV_ENCODING.get) + [None]
+_STATUS_ROW = {status: i for i, status in enumerate(MASK_STATUSES[:-1])}
+_ENV_ROW = {env: i for i, env in enumerate(MASK_ENVS[:-1])}
+
+class ActionIndex:
+    """
+    Immutable two-way mapping between action names and indices. Single
+    lookups are a dict or tuple access; the batch methods translate whole
+    arrays at once for replay and batch training.
+    """
+    
+    __slots__ = ('names', 'index', '_names_array', '_sorted_names', '_sorted_order')
+    
+    def __init__(self, action_names):
+        names = tuple(action_names)
+        object.__setattr__(self, 'names', names)
+        object.__setattr__(self, 'index', MappingProxyType({name: i for i, name in enumerate(names)}))
+        names_array = np.array(names, dtype=str)
+        order = np.argsort(names_array, kind='stable')
+        object.__setattr__(self, '_names_array', names_array)
+        object.__setattr__(self, '_sorted_names', names_array[order])
+        object.__setattr__(self, '_sorted_order', order)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ActionIndex is immutable")
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def __contains__(self, name):
+        return name in self.index
+    
+    def to_index(self, name):
+        return self.index[name]
+    
+    def to_name(self, index):
+        return self.names[index]
+    
+    def to_indices(self, names):
+        """Array of indices for a sequence or array of names (KeyError if unknown)"""
+        if isinstance(names, np.ndarray) and len(self.names):
+            # Binary search against the sorted names, no per-item Python work
+            positions = np.minimum(np.searchsorted(self._sorted_names, names), len(self.names) - 1)
+            found = self._sorted_names[positions] == names
+            if not found.all():
+                raise KeyError(str(names[~found][0]))
+            return self._sorted_order[positions]
+        return np.fromiter(map(self.index.__getitem__, names), dtype=np.int64)
+    
+    def to_names(self, indices):
+        """Array of action names for a sequence or array of indices"""
+        return self._names_array[np.asarray(indices, dtype=np.int64)]
 
 class AppActionSpace:
     def __init__(self, app_spec):
         self.app_spec = app_spec
         self.actions = {action['name']: action for action in app_spec['available_actions']}
         self.action_names = list(self.actions.keys())
+        self.action_index = ActionIndex(self.action_names)
+        self._pending = set()
+        self._build_valid_masks()
+    
+    def _build_valid_masks(self):
+        """Precompute action validity for every (status, env) combination"""
+        self.valid_masks = np.zeros((len(MASK_STATUSES), len(MASK_ENVS), len(self.action_names)), dtype=bool)
+        self._valid_lists = [[()] * len(MASK_ENVS) for _ in MASK_STATUSES]
+        
+        for s, status in enumerate(MASK_STATUSES):
+            for e, env in enumerate(MASK_ENVS):
+                state = {'status': status, 'env': env}
+                for a, action in enumerate(self.actions.values()):
+                    if self._is_action_safe(action, state):
+                        self.valid_masks[s, e, a] = True
+                self._valid_lists[s][e] = tuple(
+                    name for a, name in enumerate(self.action_names) if self.valid_masks[s, e, a]
+                )
+    
+    def _mask_row(self, state):
+        """(status, env) indices into the validity tables for a state"""
+        s = _STATUS_ROW.get(state.get('status', 'healthy'), len(MASK_STATUSES) - 1)
+        e = _ENV_ROW.get(state.get('env', 'dev'), len(MASK_ENVS) - 1)
+        return s, e
     
     def get_valid_actions(self, current_state):
         """Get list of valid actions based on current state"""
-        valid_actions = []
-        
-        # Basic safety rules
-        for action_name, action in self.actions.items():
-            if self._is_action_safe(action, current_state):
-                valid_actions.append(action_name)
-        
-        return valid_actions
+        s, e = self._mask_row(current_state)
+        return list(self._valid_lists[s][e])
+    
+    def get_valid_mask(self, current_state):
+        """Boolean array over action_names marking the valid actions"""
+        s, e = self._mask_row(current_state)
+        return self.valid_masks[s, e]
     
     def _is_action_safe(self, action, state):
         """Check if action is safe to execute in current state"""
@@ -33,42 +116,63 @@ class AppActionSpace:
         
         return True
     
-    def execute_action(self, action_name, dry_run=True):
+    def _dry_run_result(self, action_name):
+        """Result of simulating an action"""
+        action = self.actions[action_name]
+        return {
+            "success": True,
+            "action": action_name,
+            "command": action['command'],
+            "risk_level": action['risk_level'],
+            "executed": False,
+            "message": f"Would execute: {action['command']}"
+        }
+    
+    def _action_timeout(self, action_name, timeout=None):
+        """Timeout for an action: explicit, from the spec, or the default"""
+        from rl.action_executor import DEFAULT_ACTION_TIMEOUT
+        if timeout is not None:
+            return timeout
+        return self.actions[action_name].get('timeout', DEFAULT_ACTION_TIMEOUT)
+    
+    def execute_action(self, action_name, dry_run=True, timeout=None):
         """Execute an action (dry_run=True for simulation)"""
         if action_name not in self.actions:
             return {"success": False, "error": f"Unknown action: {action_name}"}
         
-        action = self.actions[action_name]
-        command = action['command']
-        
         if dry_run:
+            return self._dry_run_result(action_name)
+        
+        # Same path as execute_action_async, so `cmd &` actions return once the shell exits
+        try:
+            return self.execute_action_async(action_name, dry_run=False, timeout=timeout).result()
+        except Exception as e:
             return {
-                "success": True,
+                "success": False,
                 "action": action_name,
-                "command": command,
-                "risk_level": action['risk_level'],
-                "executed": False,
-                "message": f"Would execute: {command}"
+                "error": str(e)
             }
-        else:
-            # In real implementation, execute the command
-            import subprocess
-            try:
-                result = subprocess.run(command, shell=True, capture_output=True, text=True)
-                return {
-                    "success": result.returncode == 0,
-                    "action": action_name,
-                    "command": command,
-                    "executed": True,
-                    "output": result.stdout,
-                    "error": result.stderr
-                }
-            except Exception as e:
-                return {
-                    "success": False,
-                    "action": action_name,
-                    "error": str(e)
-                }
+    
+    def execute_action_async(self, action_name, dry_run=True, timeout=None):
+        """Execute an action without blocking, returning a Future of the result"""
+        from rl.action_executor import shared_executor, completed_future
+        
+        if action_name not in self.actions:
+            return completed_future({"success": False, "error": f"Unknown action: {action_name}"})
+        
+        if dry_run:
+            return completed_future(self._dry_run_result(action_name))
+        
+        future = shared_executor().submit(action_name, self.actions[action_name]['command'],
+                                          self._action_timeout(action_name, timeout))
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+    
+    def close(self):
+        """Cancel this app's running actions; the shared executor keeps serving other apps"""
+        for future in list(self._pending):
+            future.cancel()
     
     def get_action_space_size(self):
         """Get the size of action space for RL algorithms"""
@@ -76,11 +180,19 @@ class AppActionSpace:
     
     def action_to_index(self, action_name):
         """Convert action name to index for RL algorithms"""
-        return self.action_names.index(action_name)
+        return self.action_index.to_index(action_name)
     
     def index_to_action(self, index):
         """Convert index to action name for RL algorithms"""
-        return self.action_names[index]
+        return self.action_index.to_name(index)
+    
+    def actions_to_indices(self, action_names):
+        """Convert a batch of action names to an array of indices"""
+        return self.action_index.to_indices(action_names)
+    
+    def indices_to_actions(self, indices):
+        """Convert a batch of indices to an array of action names"""
+        return self.action_index.to_names(indices)
 
 def create_action_space(app_spec_path):
     """Factory function to create action space from app spec file"""
@@ -1,41 +1,44 @@
 import json
-import re
+import time
+from collections import deque
 from datetime import datetime
+from rl.log_matcher import LogPatternMatcher, SEVERITY_LEVELS, ENV_PATTERN
+
+class _Encoding(dict):
+    """Lookup table that encodes unknown values as 0"""
+    def __missing__(self, key):
+        return 0
+
+# Encoding tables shared by state_to_vector and rl.state_encoding.states_to_matrix
+STATUS_ENCODING = _Encoding({"healthy": 0, "degraded": 1, "critical": 2})
+ENV_ENCODING = _Encoding({"dev": 0, "stage": 1, "prod": 2})
+SEVERITY_ENCODING = _Encoding(SEVERITY_LEVELS)
+STATE_VECTOR_SIZE = 5
 
 class AppStateMapper:
     def __init__(self, app_spec):
         self.app_spec = app_spec
         self.app_name = app_spec['name']
         self.error_patterns = {p['pattern']: p['severity'] for p in app_spec['error_patterns']}
+        self.matcher = LogPatternMatcher(app_spec['error_patterns'])
     
     def extract_state_from_logs(self, log_lines):
         """Convert log lines to RL state representation"""
+        error_count, max_severity, env = self.matcher.scan(log_lines)
+        return self._build_state(error_count, max_severity, env or "dev")
+    
+    def _build_state(self, error_count, max_severity, env):
+        """Build the RL state dict from aggregated error counters"""
         state = {
             "app": self.app_name,
-            "env": "dev",  # default
+            "env": env,
             "status": "healthy",
-            "error_count": 0,
-            "error_severity": "none",
+            "error_count": error_count,
+            "error_severity": max_severity,
             "timestamp": datetime.now().isoformat(),
-            "performance_score": 100
+            "performance_score": max(0, 100 - (error_count * 10))
         }
         
-        error_count = 0
-        max_severity = "none"
-        
-        for line in log_lines:
-            # Check for error patterns
-            for pattern, severity in self.error_patterns.items():
-                if re.search(pattern, line, re.IGNORECASE):
-                    error_count += 1
-                    if self._severity_level(severity) > self._severity_level(max_severity):
-                        max_severity = severity
-            
-            # Extract environment if mentioned
-            env_match = re.search(r'env[ironment]*[:\s]*(\w+)', line, re.IGNORECASE)
-            if env_match:
-                state["env"] = env_match.group(1).lower()
-        
         # Determine overall status
         if error_count == 0:
             state["status"] = "healthy"
@@ -44,33 +47,109 @@ class AppStateMapper:
         else:
             state["status"] = "critical"
         
-        state["error_count"] = error_count
-        state["error_severity"] = max_severity
-        state["performance_score"] = max(0, 100 - (error_count * 10))
-        
         return state
     
     def _severity_level(self, severity):
         """Convert severity to numeric level"""
-        levels = {"none": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
-        return levels.get(severity, 0)
+        return SEVERITY_LEVELS.get(severity, 0)
     
     def state_to_vector(self, state):
         """Convert state dict to numeric vector for RL"""
         # Simple encoding for RL algorithms
-        status_encoding = {"healthy": 0, "degraded": 1, "critical": 2}
-        env_encoding = {"dev": 0, "stage": 1, "prod": 2}
-        severity_encoding = {"none": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
-        
         vector = [
-            status_encoding.get(state["status"], 0),
-            env_encoding.get(state["env"], 0),
+            STATUS_ENCODING.get(state["status"], 0),
+            ENV_ENCODING.get(state["env"], 0),
             min(state["error_count"], 10),  # cap at 10
-            severity_encoding.get(state["error_severity"], 0),
+            SEVERITY_ENCODING.get(state["error_severity"], 0),
             state["performance_score"] / 100.0  # normalize to 0-1
         ]
         
         return vector
+    
+    def states_to_matrix(self, states, count=None):
+        """Convert many state dicts to an (N, 5) float32 matrix for RL"""
+        from rl.state_encoding import states_to_matrix
+        return states_to_matrix(states, count)
+
+class SlidingWindowStateMapper(AppStateMapper):
+    """
+    Incremental state mapper that keeps running error counters over the last
+    window_seconds and/or window_lines of logs. Lines update the counters as
+    they arrive and expired lines are subtracted again, so the current state
+    is available at any moment without rescanning history.
+    """
+    
+    def __init__(self, app_spec, window_seconds=300, window_lines=None, clock=time.monotonic):
+        super().__init__(app_spec)
+        self.window_seconds = window_seconds
+        self.window_lines = window_lines
+        self.clock = clock
+        self.reset()
+    
+    def reset(self):
+        """Forget every line seen so far"""
+        # Only lines that matched a pattern are kept: (time, line_number, hits, level)
+        self._events = deque()
+        self._line_number = 0
+        self._error_count = 0
+        self._severity_counts = [0] * len(SEVERITY_LEVELS)
+        self._env = "dev"
+    
+    def observe(self, line, now=None):
+        """Add one log line to the window"""
+        if now is None:
+            now = self.clock()
+        self._line_number += 1
+        
+        hits, severity = self.matcher.match_line(line)
+        if hits:
+            level = self._severity_level(severity)
+            self._events.append((now, self._line_number, hits, level))
+            self._error_count += hits
+            self._severity_counts[level] += 1
+        
+        env_match = ENV_PATTERN.search(line)
+        if env_match:
+            self._env = env_match.group(1).lower()
+    
+    def observe_lines(self, log_lines, now=None):
+        """Add a batch of log lines to the window"""
+        if now is None:
+            now = self.clock()
+        for line in log_lines:
+            self.observe(line, now)
+        self._expire(now)
+    
+    def _expire(self, now):
+        """Drop lines that fell out of the time or line window"""
+        events = self._events
+        oldest_time = now - self.window_seconds if self.window_seconds is not None else None
+        oldest_line = self._line_number - self.window_lines if self.window_lines is not None else None
+        
+        while events:
+            seen_at, line_number, hits, level = events[0]
+            if (oldest_time is None or seen_at >= oldest_time) and \
+               (oldest_line is None or line_number > oldest_line):
+                break
+            events.popleft()
+            self._error_count -= hits
+            self._severity_counts[level] -= 1
+    
+    def current_state(self, now=None):
+        """Get the state for the current window"""
+        self._expire(self.clock() if now is None else now)
+        
+        max_severity = "none"
+        for severity, level in SEVERITY_LEVELS.items():
+            if level and self._severity_counts[level]:
+                max_severity = severity
+        
+        return self._build_state(self._error_count, max_severity, self._env)
+    
+    def extract_state_from_logs(self, log_lines):
+        """Add log lines to the window and return the updated state"""
+        self.observe_lines(log_lines)
+        return self.current_state()
 
 def create_state_mapper(app_spec_path):
     """Factory function to create state mapper from app spec file"""
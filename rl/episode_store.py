@@ -0,0 +1,508 @@
+"""
+Episode Store - Append-only step history with columnar compaction
+
+Layout of the store directory:
+    active.jsonl            current segment, one JSON record per step
+    segment-000001.npz      older segments, compacted into NumPy columns
+    index.json              time range, row count and apps of every segment
+    .lock                   serializes rotation against concurrent appends
+
+Readers use the index to skip segments outside the requested app or time
+range and load one segment at a time, so queries never hold the whole
+history in memory. The active segment is indexed in memory as it grows:
+each read parses only the bytes appended since the previous one.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+DEFAULT_STORE_PATH = 'reports/episodes'
+LEGACY_RESULTS_PATH = 'reports/demo_results.json'
+MAX_SEGMENT_BYTES = 16 << 20   # rotate the active segment past 16 MiB
+
+STRING_COLUMNS = ('app', 'episode', 'scenario', 'status', 'env', 'error_severity', 'action')
+NUMERIC_COLUMNS = {
+    'time': 'float64',
+    'step': 'int32',
+    'error_count': 'int32',
+    'performance_score': 'float32',
+    'reward': 'float64',
+    'action_success': 'bool',
+    'q_table_size': 'int32'
+}
+STATE_FIELDS = ('status', 'env', 'error_count', 'error_severity', 'performance_score')
+
+
+def store_input_paths(root=DEFAULT_STORE_PATH):
+    """Files whose mtimes change whenever a store's contents change"""
+    return [os.path.join(root, 'active.jsonl'), os.path.join(root, 'index.json')]
+
+
+def episode_records(app_name, results, q_table_size=None, episode_id=None):
+    """Flatten run_episode() step results into store records"""
+    episode_id = episode_id or uuid.uuid4().hex[:16]
+    now = time.time()
+    records = []
+    for result in results:
+        state = result['state']
+        try:
+            timestamp = datetime.fromisoformat(state['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            timestamp = now
+        record = {
+            'app': app_name,
+            'episode': episode_id,
+            'time': timestamp,
+            'step': result['step'],
+            'scenario': result.get('scenario'),
+            'action': result['action'],
+            'reward': result['reward'],
+            'action_success': result['action_success'],
+            'q_table_size': q_table_size if q_table_size is not None else -1
+        }
+        for field in STATE_FIELDS:
+            record[field] = state.get(field)
+        records.append(record)
+    return records
+
+
+class ActiveIndex:
+    """
+    In-memory index of the active segment, advanced incrementally: the
+    offset of the last complete line read, then per app the step count,
+    the (offset, time) of every line and the records of its latest
+    episode. Once the segment is rotated away the index starts over.
+    """
+
+    HEAD_BYTES = 256   # start of the first line: app, episode id and time, unique per segment
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self, head=b''):
+        self.head = head
+        self.offset = 0
+        self.rows = {}
+        self.lines = {}
+        self.latest = {}
+        self.last_app = None
+
+    def _same_segment(self, f, head):
+        """Whether open file f is the segment whose first bytes are head"""
+        f.seek(0)
+        return f.read(len(head)) == head
+
+    def refresh(self):
+        """Index lines appended since the last call; returns the segment's head bytes"""
+        with self._lock:
+            try:
+                f = open(self.path, 'rb')
+            except OSError:
+                self._reset()
+                return b''
+            with f:
+                size = os.fstat(f.fileno()).st_size
+                if size < self.offset or not self._same_segment(f, self.head):
+                    self._reset()
+                if size == self.offset:
+                    return self.head
+                f.seek(self.offset)
+                data = f.read(size - self.offset)
+
+            # A line still being written is picked up by a later refresh
+            end = data.rfind(b'\n') + 1
+            if self.offset == 0:
+                self.head = data[:min(end, self.HEAD_BYTES)]
+            position = self.offset
+            for raw in data[:end].splitlines(keepends=True):
+                line_offset, position = position, position + len(raw)
+                try:
+                    record = json.loads(raw)
+                    app = record['app']
+                except (ValueError, KeyError, TypeError):
+                    continue
+                self.rows[app] = self.rows.get(app, 0) + 1
+                self.lines.setdefault(app, []).append((line_offset, record.get('time', 0)))
+                latest = self.latest.get(app)
+                if latest is None or latest[-1].get('episode') != record.get('episode'):
+                    self.latest[app] = latest = []
+                latest.append(record)
+                self.last_app = app
+            self.offset += end
+            return self.head
+
+    def app_rows(self):
+        """{app: steps} in the active segment"""
+        self.refresh()
+        with self._lock:
+            return dict(self.rows)
+
+    def latest_episode(self, app=None):
+        """Records of the newest episode (of app) in the active segment"""
+        self.refresh()
+        with self._lock:
+            return list(self.latest.get(self.last_app if app is None else app, ()))
+
+    def records(self, app, start=None, end=None):
+        """An app's records in the active segment, read by offset"""
+        head = self.refresh()
+        with self._lock:
+            offsets = [offset for offset, t in self.lines.get(app, ())
+                       if (start is None or t >= start) and (end is None or t <= end)]
+        if not offsets:
+            return []
+        records = []
+        try:
+            with open(self.path, 'rb') as f:
+                if not self._same_segment(f, head):
+                    # Rotated since the refresh; the next query finds these
+                    # lines in the new segment
+                    return []
+                for offset in offsets:
+                    f.seek(offset)
+                    records.append(json.loads(f.readline()))
+        except (OSError, ValueError):
+            pass
+        return records
+
+
+class EpisodeStore:
+    """
+    Append-only store of agent steps. Writers append JSON lines to the
+    active segment; once it passes max_segment_bytes it is rotated out and
+    compacted into a columnar .npz segment. Several threads and processes
+    can append to the same store.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_PATH, max_segment_bytes=MAX_SEGMENT_BYTES, compact_on_rotate=True):
+        self.root = root
+        self.max_segment_bytes = max_segment_bytes
+        self.compact_on_rotate = compact_on_rotate
+        self.active_path = os.path.join(root, 'active.jsonl')
+        self.index_path = os.path.join(root, 'index.json')
+        self._lock = threading.Lock()
+        self.active = ActiveIndex(self.active_path)
+
+    @contextmanager
+    def _file_lock(self, exclusive):
+        """
+        Cross-process lock: shared for appends, exclusive for rotation. On
+        Windows msvcrt only has exclusive locks, so appends serialize too.
+        """
+        if (fcntl is None and msvcrt is None) or not os.path.isdir(self.root):
+            # Nothing has been written yet, so there is nothing to guard
+            yield
+            return
+        with open(os.path.join(self.root, '.lock'), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            else:
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(0.01)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def input_paths(self):
+        """Files whose mtimes change whenever the store's contents change"""
+        return store_input_paths(self.root)
+
+    def append(self, records):
+        """Append records (flat dicts) as one write to the active segment"""
+        if not records:
+            return
+        data = ''.join(json.dumps(r, separators=(',', ':')) + '\n' for r in records)
+        # Created on first write, so readers and dashboards never create it
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock:
+            self._rotate_if_needed()
+            with self._file_lock(exclusive=False):
+                with open(self.active_path, 'a') as f:
+                    f.write(data)
+
+    def append_episode(self, app_name, results, q_table_size=None, episode_id=None):
+        """Record one run_episode() result list, returning its episode id"""
+        records = episode_records(app_name, results, q_table_size, episode_id)
+        self.append(records)
+        return records[0]['episode'] if records else None
+
+    # Segments
+
+    def load_index(self):
+        """Segment entries, oldest first"""
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)['segments']
+        except (FileNotFoundError, ValueError, KeyError):
+            return []
+
+    def _save_index(self, segments):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'segments': segments}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _rotate_if_needed(self):
+        try:
+            if os.path.getsize(self.active_path) < self.max_segment_bytes:
+                return
+        except OSError:
+            return
+        self.rotate()
+
+    def rotate(self):
+        """Close the active segment and start a new one"""
+        with self._file_lock(exclusive=True):
+            try:
+                if os.path.getsize(self.active_path) == 0:
+                    return
+            except OSError:
+                # Another process rotated it first
+                return
+
+            segments = self.load_index()
+            seq = max((s['seq'] for s in segments), default=0) + 1
+            name = f"segment-{seq:06d}.jsonl"
+            try:
+                os.replace(self.active_path, os.path.join(self.root, name))
+            except PermissionError:
+                # Windows refuses while a reader has the file open; a later append retries
+                return
+
+            entry = {'seq': seq, 'file': name, 'format': 'jsonl'}
+            entry.update(self._summarize(self._read_jsonl(os.path.join(self.root, name))))
+            segments.append(entry)
+            self._save_index(segments)
+
+            if self.compact_on_rotate:
+                self._compact(segments)
+
+    def compact(self):
+        """Convert every rotated JSONL segment into a columnar .npz segment"""
+        with self._file_lock(exclusive=True):
+            self._compact(self.load_index())
+
+    def _compact(self, segments):
+        import numpy as np
+
+        for entry in segments:
+            if entry['format'] != 'jsonl':
+                continue
+            jsonl_path = os.path.join(self.root, entry['file'])
+            records = list(self._read_jsonl(jsonl_path))
+
+            columns = {}
+            for column in STRING_COLUMNS:
+                values = ['' if r.get(column) is None else str(r[column]) for r in records]
+                uniques, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+                columns[column] = codes.astype(np.int32)
+                columns[column + '__values'] = uniques
+            for column, dtype in NUMERIC_COLUMNS.items():
+                columns[column] = np.array([r.get(column) if r.get(column) is not None else -1 for r in records],
+                                           dtype=dtype)
+
+            name = entry['file'][:-len('.jsonl')] + '.npz'
+            np.savez(os.path.join(self.root, name), **columns)
+            entry['file'] = name
+            entry['format'] = 'npz'
+            self._save_index(segments)
+            os.remove(jsonl_path)
+
+    def _summarize(self, records):
+        """Index entry fields for a segment: rows, time range, rows per app"""
+        rows, start, end, apps = 0, None, None, {}
+        for record in records:
+            rows += 1
+            t = record['time']
+            start = t if start is None else min(start, t)
+            end = t if end is None else max(end, t)
+            apps[record['app']] = apps.get(record['app'], 0) + 1
+        return {'rows': rows, 'start': start, 'end': end, 'apps': apps}
+
+    # Reads
+
+    def _read_jsonl(self, path):
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+        except FileNotFoundError:
+            return
+
+    def _read_npz(self, path, app, start, end):
+        import numpy as np
+
+        with np.load(path) as data:
+            mask = np.ones(len(data['time']), dtype=bool)
+            if app is not None:
+                matches = np.flatnonzero(data['app__values'] == app)
+                if not len(matches):
+                    return
+                mask &= data['app'] == matches[0]
+            if start is not None:
+                mask &= data['time'] >= start
+            if end is not None:
+                mask &= data['time'] <= end
+            rows = np.flatnonzero(mask)
+            if not len(rows):
+                return
+
+            columns = {}
+            for column in STRING_COLUMNS:
+                values = data[column + '__values'][data[column][rows]].tolist()
+                columns[column] = [v if v != '' else None for v in values]
+            for column in NUMERIC_COLUMNS:
+                columns[column] = data[column][rows].tolist()
+
+        names = list(columns)
+        for values in zip(*(columns[name] for name in names)):
+            yield dict(zip(names, values))
+
+    def _segment_records(self, entry, app, start, end):
+        path = os.path.join(self.root, entry['file'])
+        if entry['format'] == 'npz':
+            yield from self._read_npz(path, app, start, end)
+            return
+        for record in self._read_jsonl(path):
+            if self._matches(record, app, start, end):
+                yield record
+
+    @staticmethod
+    def _matches(record, app, start, end):
+        if app is not None and record.get('app') != app:
+            return False
+        t = record.get('time', 0)
+        return (start is None or t >= start) and (end is None or t <= end)
+
+    @staticmethod
+    def _overlaps(entry, app, start, end):
+        if app is not None and app not in entry['apps']:
+            return False
+        if start is not None and entry['end'] is not None and entry['end'] < start:
+            return False
+        if end is not None and entry['start'] is not None and entry['start'] > end:
+            return False
+        return True
+
+    def query(self, app=None, start=None, end=None):
+        """Generate step records for an app and/or time range, oldest first"""
+        with self._file_lock(exclusive=False):
+            segments = [s for s in self.load_index() if self._overlaps(s, app, start, end)]
+        for entry in segments:
+            yield from self._segment_records(entry, app, start, end)
+        if app is not None:
+            yield from self.active.records(app, start, end)
+            return
+        for record in self._read_jsonl(self.active_path):
+            if self._matches(record, app, start, end):
+                yield record
+
+    def app_rows(self):
+        """{app: number of recorded steps}, from the index plus the active segment"""
+        with self._file_lock(exclusive=False):
+            segments = self.load_index()
+        rows = {}
+        for entry in segments:
+            for app, count in entry['apps'].items():
+                rows[app] = rows.get(app, 0) + count
+        for app, count in self.active.app_rows().items():
+            rows[app] = rows.get(app, 0) + count
+        return rows
+
+    def latest_episode(self, app=None):
+        """Records of the most recently written episode, [] if there is none"""
+        latest = self.active.latest_episode(app)
+        if latest:
+            return latest
+        for entry in reversed(self.load_index()):
+            if not self._overlaps(entry, app, None, None):
+                continue
+            records = self._segment_records(entry, app, None, None)
+
+            # Episodes are appended in one write, so the last one in a segment is whole
+            latest = []
+            for record in records:
+                if not latest or record['episode'] != latest[-1]['episode']:
+                    latest = []
+                latest.append(record)
+            if latest:
+                return latest
+        return []
+
+
+def episode_results(records):
+    """Legacy demo_results.json view of one episode's records"""
+    return {
+        "app_name": records[0]['app'],
+        "total_steps": len(records),
+        "results": [
+            {
+                "step": r['step'],
+                "scenario": r['scenario'],
+                "state": dict({field: r[field] for field in STATE_FIELDS}, app=r['app']),
+                "action": r['action'],
+                "reward": r['reward'],
+                "action_success": r['action_success']
+            }
+            for r in records
+        ],
+        "final_policy": {
+            "app_name": records[0]['app'],
+            "q_table_size": records[-1]['q_table_size']
+        }
+    }
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def shared_store(root=DEFAULT_STORE_PATH):
+    """One EpisodeStore per path for repeated readers, so its active index persists"""
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = EpisodeStore(root)
+        return store
+
+
+def load_demo_results(store_path=DEFAULT_STORE_PATH, legacy_path=LEGACY_RESULTS_PATH):
+    """Latest episode in demo_results.json shape, from the store or a legacy file"""
+    if os.path.isdir(store_path):
+        records = shared_store(store_path).latest_episode()
+        if records:
+            return episode_results(records)
+    if os.path.exists(legacy_path):
+        with open(legacy_path, 'r') as f:
+            return json.load(f)
+    return None
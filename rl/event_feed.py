@@ -0,0 +1,108 @@
+"""
+Event Feed - Live stream of agent decisions (state, action, reward)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from rl.log_follower import LogFollower
+
+DEFAULT_EVENTS_PATH = 'reports/agent_events.jsonl'
+DEFAULT_HISTORY = 1000
+MAX_EVENTS_BYTES = 10 << 20   # rotate the spool file past 10 MiB
+
+
+class EventFeed:
+    """
+    In-memory publish/subscribe feed. Each published event gets an
+    increasing id and is kept in a bounded history, so readers just ask
+    for everything after the last id they saw and wait for more; slow
+    readers never hold back publishers.
+    """
+
+    def __init__(self, history=DEFAULT_HISTORY):
+        self.events = deque(maxlen=history)
+        self.last_id = 0
+        self._condition = threading.Condition()
+
+    def publish(self, event):
+        """Add an event dict to the feed and wake waiting readers"""
+        with self._condition:
+            self.last_id += 1
+            self.events.append((self.last_id, event))
+            self._condition.notify_all()
+            return self.last_id
+
+    def events_after(self, event_id, timeout=None):
+        """
+        (id, event) pairs newer than event_id. With a timeout, waits up to
+        that many seconds for one to arrive, returning [] if none did.
+        """
+        with self._condition:
+            if timeout and self.last_id <= event_id:
+                self._condition.wait_for(lambda: self.last_id > event_id, timeout)
+            if self.last_id <= event_id:
+                return []
+            # ids are contiguous, so the newest len(...) of them are in memory
+            missing = min(self.last_id - event_id, len(self.events))
+            return list(self.events)[-missing:]
+
+
+class JsonlEventSink:
+    """
+    Agent event listener appending one JSON line per event to a spool
+    file that dashboards in other processes follow. Each line is a single
+    append, so several agents can share the file.
+    """
+
+    def __init__(self, path=DEFAULT_EVENTS_PATH, max_bytes=MAX_EVENTS_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._rotate_if_needed()
+            with open(self.path, 'a') as f:
+                f.write(line)
+
+    def _rotate_if_needed(self):
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+            os.replace(self.path, self.path + '.1')
+        except OSError:
+            pass
+
+
+def follow_event_file(feed, path=DEFAULT_EVENTS_PATH, poll_interval=0.25):
+    """Publish events appended to a spool file into feed, from a daemon thread"""
+    # Skip what was already there, but not the first events of a new file
+    from_start = not os.path.exists(path)
+
+    def run():
+        follower = LogFollower(path, poll_interval=poll_interval, from_start=from_start)
+        for line in follower.lines(follow=True):
+            try:
+                feed.publish(json.loads(line))
+            except ValueError:
+                continue
+
+    thread = threading.Thread(target=run, name="event-follower", daemon=True)
+    thread.start()
+    return thread
+
+
+def transition_event(app_name, state, action, reward):
+    """Event for one agent decision and the reward it earned"""
+    return {
+        "type": "transition",
+        "app": app_name,
+        "time": time.time(),
+        "state": state,
+        "action": action,
+        "reward": reward
+    }
@@ -0,0 +1,147 @@
+"""
+Log Follower - Streams an app log file like `tail -F`
+"""
+
+import os
+import time
+
+DEFAULT_CHUNK_SIZE = 1 << 20     # 1 MiB reads
+MAX_LINE_BYTES = 1 << 20         # longer lines are split to keep memory bounded
+
+
+class LogFollower:
+    """
+    Follows a log file by path, surviving rotation (file replaced) and
+    truncation (file shrunk in place). The file is read in large chunks and
+    only the current chunk plus one partial line are ever held in memory,
+    so memory stays constant no matter how large the log grows.
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, poll_interval=0.5,
+                 from_start=True, encoding='utf-8'):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+        self.encoding = encoding
+
+        self._file = None
+        self._identity = None
+        self._partial = b''
+
+    def _open(self, seek_end=False):
+        """Open the log file, returning False if it does not exist yet"""
+        try:
+            self._file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        self._partial = b''
+        if seek_end:
+            self._file.seek(0, os.SEEK_END)
+        return True
+
+    def _reopen_if_changed(self):
+        """Handle rotation and truncation, returning True if the file changed"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Rotated away and not recreated yet: keep the old handle
+            return False
+
+        if self._file is None:
+            return self._open()
+
+        if (stat.st_dev, stat.st_ino) != self._identity:
+            # Rotated: the old file was fully drained before we got here
+            self._file.close()
+            return self._open()
+
+        if stat.st_size < self._file.tell():
+            # Truncated in place (copytruncate): start again from the top
+            self._file.seek(0)
+            self._partial = b''
+            return True
+
+        return False
+
+    def _read_available(self):
+        """Yield complete lines until the end of the file is reached"""
+        if self._file is None and not self._open(seek_end=not self.from_start):
+            return
+
+        while True:
+            chunk = self._file.read(self.chunk_size)
+            if not chunk:
+                return
+
+            data = self._partial + chunk
+            lines = data.split(b'\n')
+            self._partial = lines.pop()
+            if len(self._partial) > MAX_LINE_BYTES:
+                lines.append(self._partial)
+                self._partial = b''
+
+            for line in lines:
+                yield line.rstrip(b'\r').decode(self.encoding, errors='replace')
+
+    def _flush_partial(self):
+        """Return the trailing unterminated line, if any"""
+        if not self._partial:
+            return None
+        line = self._partial.rstrip(b'\r').decode(self.encoding, errors='replace')
+        self._partial = b''
+        return line
+
+    def lines(self, follow=True):
+        """Generate log lines; with follow=True wait for new lines forever"""
+        try:
+            while True:
+                yield from self._read_available()
+
+                if not follow:
+                    line = self._flush_partial()
+                    if line is not None:
+                        yield line
+                    return
+
+                if not self._reopen_if_changed():
+                    time.sleep(self.poll_interval)
+        finally:
+            self.close()
+
+    def batches(self, batch_size=1000, follow=True):
+        """Generate lists of at most batch_size lines, flushing whenever caught up"""
+        try:
+            batch = []
+            while True:
+                for line in self._read_available():
+                    batch.append(line)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+
+                if not follow:
+                    line = self._flush_partial()
+                    if line is not None:
+                        batch.append(line)
+                    if batch:
+                        yield batch
+                    return
+
+                if batch:
+                    yield batch
+                    batch = []
+
+                if not self._reopen_if_changed():
+                    time.sleep(self.poll_interval)
+        finally:
+            self.close()
+
+    def close(self):
+        """Close the underlying file handle"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
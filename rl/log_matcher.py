@@ -0,0 +1,129 @@
+"""
+Log Pattern Matcher - Single-pass matching of app spec error patterns
+"""
+
+import re
+
+SEVERITY_LEVELS = {"none": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
+
+ENV_PATTERN = re.compile(r'env[ironment]*[:\s]*(\w+)', re.IGNORECASE)
+
+# Group references by number (\1, (?(1)...)), unescaped; inside a combined
+# regex the numbers point at other patterns' groups
+NUMBERED_REFERENCE = re.compile(r'(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)')
+
+
+class LogPatternMatcher:
+    """
+    Compiles all error patterns of an app spec once, into one combined regex.
+    Patterns are grouped by severity, one named group per severity, so a
+    single scan per line rejects clean lines and match.lastgroup names a
+    severity that fired. Only the severity groups that fire are re-checked,
+    pattern by pattern, to keep the per-pattern error count of the original
+    mapper; a group holding a single pattern needs no rescan at all.
+    """
+
+    def __init__(self, error_patterns, flags=re.IGNORECASE):
+        unique = {p['pattern']: p['severity'] for p in error_patterns}
+        self.patterns = list(unique.items())
+        self._compiled = [re.compile(pattern, flags) for pattern, _ in self.patterns]
+        self._levels = [SEVERITY_LEVELS.get(severity, 0) for _, severity in self.patterns]
+
+        by_severity = {}
+        for (pattern, severity), regex in zip(self.patterns, self._compiled):
+            by_severity.setdefault(severity, []).append((pattern, regex))
+
+        # (severity, level, regex of the whole group, regexes of its patterns)
+        # per group; the combined regex names group i "sev<i>"
+        self._groups = []
+        self._combined = None
+
+        if not self.patterns:
+            return
+        if any(regex.groups and NUMBERED_REFERENCE.search(pattern)
+               for (pattern, _), regex in zip(self.patterns, self._compiled)):
+            # Would compile combined but silently match the wrong groups
+            return
+
+        try:
+            for severity, members in by_severity.items():
+                group = re.compile('|'.join(f'(?:{pattern})' for pattern, _ in members), flags)
+                self._groups.append((severity, SEVERITY_LEVELS.get(severity, 0), group,
+                                     [regex for _, regex in members]))
+            # One capturing group per severity keeps the regex prefix optimizations
+            # that a capturing group per pattern would disable
+            self._combined = re.compile('|'.join(
+                f"(?P<sev{i}>{group.pattern})" for i, (_, _, group, _) in enumerate(self._groups)
+            ), flags)
+            self._group_index = {f"sev{i}": i for i in range(len(self._groups))}
+        except re.error:
+            # Patterns with inline flags or repeated group names cannot be
+            # combined, so every line falls through to the individual patterns
+            self._groups = []
+            self._combined = None
+
+    def match_line(self, line):
+        """Return (hit_count, max_severity) for one log line"""
+        if not self._compiled:
+            return 0, "none"
+        if self._combined is None:
+            return self._match_each(line)
+
+        match = self._combined.search(line)
+        if match is None:
+            return 0, "none"
+
+        fired = self._group_index[match.lastgroup]
+        hits = 0
+        max_level = 0
+        max_severity = "none"
+        for i, (severity, level, group, regexes) in enumerate(self._groups):
+            if i != fired and not group.search(line):
+                continue
+            if len(regexes) == 1:
+                hits += 1
+            else:
+                hits += sum(1 for regex in regexes if regex.search(line))
+            if level > max_level:
+                max_level = level
+                max_severity = severity
+
+        return hits, max_severity
+
+    def _match_each(self, line):
+        """match_line for patterns that could not be combined"""
+        hits = 0
+        max_level = 0
+        max_severity = "none"
+        for regex, level, (_, severity) in zip(self._compiled, self._levels, self.patterns):
+            if regex.search(line):
+                hits += 1
+                if level > max_level:
+                    max_level = level
+                    max_severity = severity
+
+        return hits, max_severity
+
+    def scan(self, log_lines):
+        """Scan a batch of lines, returning (error_count, max_severity, env)"""
+        error_count = 0
+        max_level = 0
+        max_severity = "none"
+        env = None
+        match_line = self.match_line
+        env_search = ENV_PATTERN.search
+
+        for line in log_lines:
+            hits, severity = match_line(line)
+            if hits:
+                error_count += hits
+                level = SEVERITY_LEVELS.get(severity, 0)
+                if level > max_level:
+                    max_level = level
+                    max_severity = severity
+
+            env_match = env_search(line)
+            if env_match:
+                env = env_match.group(1).lower()
+
+        return error_count, max_severity, env
@@ -2,6 +2,20 @@
 Normalized Action Space - Universal action taxonomy across all apps
 """
 
+import hashlib
+import json
+import marshal
+import threading
+from collections import OrderedDict
+
+def _build_alias_index(universal_actions):
+    """Map every alias to its universal action (the first category listing it wins)"""
+    index = {}
+    for universal_action, details in universal_actions.items():
+        for alias in details['aliases']:
+            index.setdefault(alias, universal_action)
+    return index
+
 class NormalizedActionSpace:
     """
     Unified action taxonomy that works across all application types.
@@ -62,10 +76,14 @@ class NormalizedActionSpace:
         }
     }
     
+    # alias -> universal action, built once for all instances
+    ALIAS_INDEX = _build_alias_index(UNIVERSAL_ACTIONS)
+    
     def __init__(self, app_spec):
         self.app_spec = app_spec
         self.app_actions = app_spec.get('available_actions', [])
         self.normalized_map = self._build_normalized_map()
+        self.category_index = self._build_category_index()
     
     def _build_normalized_map(self):
         """Map app-specific actions to universal categories"""
@@ -75,18 +93,18 @@ class NormalizedActionSpace:
             action_name = action['name']
             
             # Find matching universal category
-            for universal_action, details in self.UNIVERSAL_ACTIONS.items():
-                if action_name in details['aliases']:
-                    mapping[action_name] = {
-                        'universal_category': universal_action,
-                        'original_action': action,
-                        'normalized_name': details['category'],
-                        'risk_level': action.get('risk_level', details['risk_level'])
-                    }
-                    break
+            universal_action = self.ALIAS_INDEX.get(action_name)
+            if universal_action is not None:
+                details = self.UNIVERSAL_ACTIONS[universal_action]
+                mapping[action_name] = {
+                    'universal_category': universal_action,
+                    'original_action': action,
+                    'normalized_name': details['category'],
+                    'risk_level': action.get('risk_level', details['risk_level'])
+                }
             
             # If no match, keep original
-            if action_name not in mapping:
+            elif action_name not in mapping:
                 mapping[action_name] = {
                     'universal_category': 'CUSTOM',
                     'original_action': action,
@@ -96,6 +114,13 @@ class NormalizedActionSpace:
         
         return mapping
     
+    def _build_category_index(self):
+        """Map each universal category to its app actions, in spec order"""
+        index = {}
+        for action_name, details in self.normalized_map.items():
+            index.setdefault(details['universal_category'], []).append(action_name)
+        return index
+    
     def get_normalized_actions(self):
         """Get list of normalized action names"""
         return [details['normalized_name'] for details in self.normalized_map.values()]
@@ -106,11 +131,7 @@ class NormalizedActionSpace:
     
     def get_equivalent_actions(self, universal_category):
         """Get all app actions that map to a universal category"""
-        return [
-            action_name 
-            for action_name, details in self.normalized_map.items() 
-            if details['universal_category'] == universal_category
-        ]
+        return list(self.category_index.get(universal_category, ()))
     
     def is_safe_action(self, action_name):
         """Check if action is safe to execute"""
@@ -122,19 +143,105 @@ class NormalizedActionSpace:
         taxonomy = {}
         
         for universal_action in self.UNIVERSAL_ACTIONS.keys():
-            equivalent = self.get_equivalent_actions(universal_action)
-            if equivalent:
-                taxonomy[universal_action] = equivalent
+            if universal_action in self.category_index:
+                taxonomy[universal_action] = list(self.category_index[universal_action])
         
         return taxonomy
 
+SPACE_CACHE_SIZE = 1024
+_space_cache = OrderedDict()
+_space_cache_lock = threading.Lock()
+
+def spec_hash(app_spec):
+    """Content hash of an app spec, for in-process cache keys"""
+    try:
+        # marshal is several times faster than json for plain spec dicts
+        data = marshal.dumps(app_spec)
+    except ValueError:
+        data = json.dumps(app_spec, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def get_normalized_space(app_spec):
+    """NormalizedActionSpace for a spec, shared through an LRU keyed by spec content"""
+    key = spec_hash(app_spec)
+    with _space_cache_lock:
+        space = _space_cache.get(key)
+        if space is not None:
+            _space_cache.move_to_end(key)
+            return space
+    
+    space = NormalizedActionSpace(app_spec)
+    with _space_cache_lock:
+        _space_cache[key] = space
+        if len(_space_cache) > SPACE_CACHE_SIZE:
+            _space_cache.popitem(last=False)
+    return space
+
+class ActionTranslator:
+    """
+    Precomputed action translation for a fleet of app specs. Holds a dense
+    (app x universal category) table of each app's first action in that
+    category, so translating an action between any two apps is two
+    lookups and whole batches translate with one array index.
+    """
+    
+    CATEGORIES = list(NormalizedActionSpace.UNIVERSAL_ACTIONS) + ['CUSTOM']
+    CATEGORY_CODES = {category: i for i, category in enumerate(CATEGORIES)}
+    
+    def __init__(self, app_specs):
+        import numpy as np
+        
+        self.app_names = [spec['name'] for spec in app_specs]
+        self.app_index = {name: i for i, name in enumerate(self.app_names)}
+        self.spaces = [get_normalized_space(spec) for spec in app_specs]
+        
+        custom = self.CATEGORY_CODES['CUSTOM']
+        self.action_names = []
+        self.action_categories = []
+        # Category code of each action, per app; unknown actions are CUSTOM
+        self.category_codes = []
+        self.table = np.full((len(app_specs), len(self.CATEGORIES)), -1, dtype=np.int32)
+        
+        for a, space in enumerate(self.spaces):
+            names = list(space.normalized_map)
+            codes = {name: self.CATEGORY_CODES[space.get_universal_category(name)] for name in names}
+            self.action_names.append(np.array(names + [None], dtype=object))
+            self.category_codes.append(codes)
+            self.action_categories.append(np.array([codes[name] for name in names], dtype=np.int32))
+            for category, actions in space.category_index.items():
+                self.table[a, self.CATEGORY_CODES.get(category, custom)] = names.index(actions[0])
+    
+    def translate(self, action_name, source_app, target_app):
+        """Equivalent of a source app action in the target app, or None"""
+        source = self.app_index[source_app]
+        target = self.app_index[target_app]
+        code = self.category_codes[source].get(action_name, self.CATEGORY_CODES['CUSTOM'])
+        return self.action_names[target][self.table[target, code]]
+    
+    def translate_batch(self, action_names, source_app, target_app):
+        """translate() for many actions at once, returning a list"""
+        import numpy as np
+        
+        source = self.app_index[source_app]
+        target = self.app_index[target_app]
+        custom = self.CATEGORY_CODES['CUSTOM']
+        codes = np.fromiter((self.category_codes[source].get(name, custom) for name in action_names),
+                            dtype=np.int32)
+        return self.action_names[target][self.table[target, codes]].tolist()
+    
+    def action_map(self, source_app, target_app):
+        """For each source action index, the target action index (-1 if none)"""
+        source = self.app_index[source_app]
+        target = self.app_index[target_app]
+        return self.table[target, self.action_categories[source]]
+
 def normalize_action_across_apps(action_name, source_app_spec, target_app_spec):
     """
     Translate an action from one app to equivalent action in another app.
     Enables RL to transfer knowledge across different applications.
     """
-    source_space = NormalizedActionSpace(source_app_spec)
-    target_space = NormalizedActionSpace(target_app_spec)
+    source_space = get_normalized_space(source_app_spec)
+    target_space = get_normalized_space(target_app_spec)
     
     # Get universal category of source action
     universal_category = source_space.get_universal_category(action_name)
@@ -0,0 +1,186 @@
+"""
+Policy File - Compact binary, memory-mappable Q-table policies
+
+Layout (little endian):
+    header      magic, version, n_actions, n_states, metadata bytes, key bytes
+    metadata    JSON: action names, hyperparameters, app spec
+    keys        UTF-8 state keys in row order, one per line
+    padding     up to a 64-byte boundary
+    q matrix    float32, n_states x n_actions
+    visited     uint8,   n_states x n_actions
+    padding     up to a 64-byte boundary
+    offsets     uint64,  n_states + 1 byte offsets of each key in `keys`
+    hashes      uint64,  n_states key hashes, sorted
+    hash rows   uint64,  n_states row of each sorted hash
+
+The sorted hash index lets a mapped policy answer lookups straight from the
+file, without decoding every state key into a Python dict first.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from rl.q_table import ArrayQTable, key_to_string, string_to_key
+
+MAGIC = b'URLPOLv1'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQQ')
+ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def key_hash(key_text):
+    """Stable 64-bit hash of a state key's string form"""
+    return int.from_bytes(hashlib.blake2b(key_text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class MappedQTable(ArrayQTable):
+    """
+    ArrayQTable whose rows live in a memory-mapped policy file. The mapping
+    is copy-on-write, so processes loading the same file share its
+    page-cached pages until one of them learns. Known states are found
+    through the file's hash index; states first seen after loading get new
+    rows tracked in an in-memory index, as in ArrayQTable.
+    """
+
+    def __init__(self, action_names, values, visited, keys_blob, offsets, hashes, hash_rows, mapping):
+        self.action_names = list(action_names)
+        self.action_index = {name: i for i, name in enumerate(self.action_names)}
+        self.values = values
+        self.visited = visited
+        self.file_states = values.shape[0]
+        self.state_index = {}
+        self.new_keys = []
+
+        self._keys_blob = keys_blob
+        self._offsets = offsets
+        self._hashes = hashes
+        self._hash_rows = hash_rows
+        self._mapping = mapping
+
+    def __len__(self):
+        return self.file_states + len(self.new_keys)
+
+    @property
+    def state_keys(self):
+        """All state keys in row order (decodes the whole file index)"""
+        text = bytes(self._keys_blob).decode('utf-8')
+        file_keys = [string_to_key(key) for key in text.split('\n')] if self.file_states else []
+        return file_keys + self.new_keys
+
+    def _file_row(self, key):
+        """Row of a key stored in the file, or -1"""
+        if not self.file_states:
+            return -1
+        text = key_to_string(key)
+        h = np.uint64(key_hash(text))
+        i = int(np.searchsorted(self._hashes, h))
+        while i < self.file_states and self._hashes[i] == h:
+            row = int(self._hash_rows[i])
+            start, end = int(self._offsets[row]), int(self._offsets[row + 1]) - 1
+            if bytes(self._keys_blob[start:end]).decode('utf-8') == text:
+                return row
+            i += 1
+        return -1
+
+    def row(self, key, create=False):
+        """Row index for a state key, or -1 if the state is unknown"""
+        row = self.state_index.get(key, -1)
+        if row < 0:
+            row = self._file_row(key)
+            if row >= 0:
+                self.state_index[key] = row
+            elif create:
+                row = len(self)
+                if row == self.values.shape[0]:
+                    self._grow()
+                self.state_index[key] = row
+                self.new_keys.append(key)
+        return row
+
+
+def save_binary_policy(filepath, q_table, metadata):
+    """Write a Q-table and its metadata in the binary policy format"""
+    n_states = len(q_table)
+    n_actions = len(q_table.action_names)
+    meta = dict(metadata, action_names=q_table.action_names)
+    meta_bytes = json.dumps(meta).encode('utf-8')
+
+    key_texts = [key_to_string(key) for key in q_table.state_keys]
+    keys_bytes = '\n'.join(key_texts).encode('utf-8')
+    lengths = np.fromiter((len(text.encode('utf-8')) + 1 for text in key_texts), np.uint64, n_states)
+    offsets = np.zeros(n_states + 1, dtype='<u8')
+    np.cumsum(lengths, out=offsets[1:])
+
+    hashes = np.fromiter((key_hash(text) for text in key_texts), np.uint64, n_states)
+    hash_rows = np.argsort(hashes, kind='stable').astype('<u8')
+    hashes = hashes[hash_rows].astype('<u8')
+
+    header = HEADER.pack(MAGIC, VERSION, n_actions, n_states, len(meta_bytes), len(keys_bytes))
+    matrix_offset = _aligned(HEADER.size + len(meta_bytes) + len(keys_bytes))
+    index_offset = _aligned(matrix_offset + n_states * n_actions * 5)
+
+    # Write next to the target and swap in, so readers never map a partial file
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(meta_bytes)
+        f.write(keys_bytes)
+        f.write(b'\0' * (matrix_offset - f.tell()))
+        f.write(np.ascontiguousarray(q_table.values[:n_states], dtype='<f4').tobytes())
+        f.write(np.ascontiguousarray(q_table.visited[:n_states], dtype=np.uint8).tobytes())
+        f.write(b'\0' * (index_offset - f.tell()))
+        f.write(offsets.tobytes())
+        f.write(hashes.tobytes())
+        f.write(hash_rows.tobytes())
+    os.replace(tmp_path, filepath)
+
+
+def is_binary_policy(filepath):
+    """Check whether a file starts with the binary policy magic"""
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_binary_policy(filepath):
+    """Memory-map a binary policy, returning (MappedQTable, metadata)"""
+    with open(filepath, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, n_actions, n_states, meta_len, keys_len = HEADER.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a binary policy file: {filepath}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported policy version {version} in {filepath}")
+
+    offset = HEADER.size
+    metadata = json.loads(mapping[offset:offset + meta_len])
+    offset += meta_len
+    keys_blob = memoryview(mapping)[offset:offset + keys_len]
+    matrix_offset = _aligned(offset + keys_len)
+    cells = n_states * n_actions
+    index_offset = _aligned(matrix_offset + cells * 5)
+
+    values = np.frombuffer(mapping, dtype='<f4', count=cells, offset=matrix_offset)
+    visited = np.frombuffer(mapping, dtype=np.bool_, count=cells, offset=matrix_offset + cells * 4)
+    offsets = np.frombuffer(mapping, dtype='<u8', count=n_states + 1, offset=index_offset)
+    hashes = np.frombuffer(mapping, dtype='<u8', count=n_states, offset=index_offset + (n_states + 1) * 8)
+    hash_rows = np.frombuffer(mapping, dtype='<u8', count=n_states, offset=index_offset + (2 * n_states + 1) * 8)
+
+    table = MappedQTable(
+        metadata['action_names'],
+        values.reshape(n_states, n_actions),
+        visited.reshape(n_states, n_actions),
+        keys_blob,
+        offsets,
+        hashes,
+        hash_rows,
+        mapping
+    )
+    return table, metadata
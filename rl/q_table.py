@@ -0,0 +1,177 @@
+"""
+Array Q-Table - Dense (states x actions) Q-value storage for the RL agent
+"""
+
+import numpy as np
+
+
+def state_key(state):
+    """Discretize a state dict into a hashable Q-table key"""
+    return (state['status'], state['env'], state['error_count'], state['error_severity'])
+
+
+def key_to_string(key):
+    """Legacy string form of a state key, as used by JSON policies"""
+    if isinstance(key, str):
+        return key
+    return "_".join(str(part) for part in key)
+
+
+def string_to_key(text):
+    """Parse a legacy 'status_env_count_severity' key back into a tuple"""
+    try:
+        status, rest = text.split('_', 1)
+        env, error_count, severity = rest.rsplit('_', 2)
+        return (status, env, int(error_count), severity)
+    except ValueError:
+        # Not a key this agent produced: keep it opaque
+        return text
+
+
+class ArrayQTable:
+    """
+    Q-values in a dense float32 array of shape (states, actions). Each
+    discretized state is assigned a row index the first time it is updated,
+    so greedy selection and TD updates are plain array operations and memory
+    grows predictably with the number of distinct states.
+    """
+
+    def __init__(self, action_names, initial_capacity=1024, dtype=np.float32):
+        self.action_names = list(action_names)
+        self.action_index = {name: i for i, name in enumerate(self.action_names)}
+        self.state_index = {}
+        self.state_keys = []
+
+        shape = (max(1, initial_capacity), len(self.action_names))
+        self.values = np.zeros(shape, dtype=dtype)
+        # Which entries were ever written: unvisited actions are ignored by max()
+        self.visited = np.zeros(shape, dtype=bool)
+
+    def __len__(self):
+        return len(self.state_keys)
+
+    def __contains__(self, key):
+        return self.row(key) >= 0
+
+    def __getitem__(self, key):
+        """Q-values recorded for a state, as {action: value}"""
+        row = self.row(key)
+        if row < 0:
+            raise KeyError(key)
+        return self._row_values(row)
+
+    def _row_values(self, row):
+        return {
+            self.action_names[a]: float(str(self.values[row, a]))
+            for a in np.flatnonzero(self.visited[row])
+        }
+
+    @property
+    def visited_states(self):
+        """States with at least one recorded Q-value; rows created only as next states don't count"""
+        return int(self.visited[:len(self)].any(axis=1).sum())
+
+    @property
+    def nbytes(self):
+        """Memory used by the value and visited arrays"""
+        return self.values.nbytes + self.visited.nbytes
+
+    def row(self, key, create=False):
+        """Row index for a state key, or -1 if the state is unknown"""
+        row = self.state_index.get(key, -1)
+        if row < 0 and create:
+            row = len(self.state_keys)
+            if row == self.values.shape[0]:
+                self._grow()
+            self.state_index[key] = row
+            self.state_keys.append(key)
+        return row
+
+    def _grow(self):
+        """Double the number of preallocated state rows"""
+        used = len(self)
+        capacity = max(1, self.values.shape[0] * 2)
+        values = np.zeros((capacity, self.values.shape[1]), dtype=self.values.dtype)
+        visited = np.zeros((capacity, self.values.shape[1]), dtype=bool)
+        values[:used] = self.values[:used]
+        visited[:used] = self.visited[:used]
+        self.values = values
+        self.visited = visited
+
+    def best_action_masked(self, key, valid_mask):
+        """Greedy action among those set in a boolean mask, or None if the state is unknown"""
+        row = self.row(key)
+        if row < 0 or not self.visited[row].any():
+            return None
+        return self.action_names[int(np.argmax(np.where(valid_mask, self.values[row], -np.inf)))]
+
+    def max_value(self, key):
+        """Highest recorded Q-value for a state, 0 if nothing was recorded"""
+        row = self.row(key)
+        if row < 0:
+            return 0
+        visited = self.visited[row]
+        if not visited.any():
+            return 0
+        return float(self.values[row][visited].max())
+
+    def update(self, key, action, reward, next_key, learning_rate, discount_factor):
+        """Apply one Q-learning update and return the new Q-value"""
+        row = self.row(key, create=True)
+        a = self.action_index[action]
+        next_max_q = self.max_value(next_key) if next_key is not None else 0
+
+        current_q = self.values[row, a]
+        new_q = current_q + learning_rate * (reward + discount_factor * next_max_q - current_q)
+        self.values[row, a] = new_q
+        self.visited[row, a] = True
+        return new_q
+
+    def update_batch(self, rows, actions, rewards, next_rows, learning_rate, discount_factor):
+        """
+        Apply Q-learning updates for a minibatch of transitions at once.
+        next_rows of -1 mean no next state. Duplicate (state, action) pairs
+        in the batch are averaged into a single update.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        actions = np.asarray(actions, dtype=np.int64)
+        next_rows = np.asarray(next_rows, dtype=np.int64)
+
+        next_max_q = np.zeros(len(rows), dtype=np.float64)
+        has_next = next_rows >= 0
+        if has_next.any():
+            nxt = next_rows[has_next]
+            recorded = np.where(self.visited[nxt], self.values[nxt], -np.inf).max(axis=1)
+            next_max_q[has_next] = np.where(np.isfinite(recorded), recorded, 0)
+
+        n_actions = self.values.shape[1]
+        flat = rows * n_actions + actions
+        values = self.values.reshape(-1)
+        td_error = rewards + discount_factor * next_max_q - values[flat]
+
+        pairs, inverse, counts = np.unique(flat, return_inverse=True, return_counts=True)
+        mean_td = np.bincount(inverse, weights=td_error) / counts
+        values[pairs] += learning_rate * mean_td
+        self.visited.reshape(-1)[pairs] = True
+        return len(pairs)
+
+    def to_dict(self):
+        """Export in the legacy {state_key: {action: q_value}} format"""
+        return {
+            key_to_string(key): self._row_values(row)
+            for row, key in enumerate(self.state_keys)
+            if self.visited[row].any()
+        }
+
+    @classmethod
+    def from_dict(cls, q_table, action_names, dtype=np.float32):
+        """Build a table from the legacy dict-of-dicts format"""
+        table = cls(action_names, initial_capacity=len(q_table), dtype=dtype)
+        for text, q_values in q_table.items():
+            row = table.row(string_to_key(text), create=True)
+            for action, value in q_values.items():
+                if action in table.action_index:
+                    a = table.action_index[action]
+                    table.values[row, a] = value
+                    table.visited[row, a] = True
+        return table
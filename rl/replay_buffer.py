@@ -0,0 +1,61 @@
+"""
+Replay Buffer - Fixed-capacity experience replay for batched Q-learning
+"""
+
+import numpy as np
+
+
+class ReplayBuffer:
+    """
+    Ring buffer of transitions stored as parallel NumPy columns (state row,
+    action index, reward, next state row). Once full, new transitions
+    overwrite the oldest ones, so memory is fixed at construction.
+    A next state row of -1 means the transition had no next state.
+    """
+
+    def __init__(self, capacity=100000, seed=None):
+        self.capacity = capacity
+        self.states = np.empty(capacity, dtype=np.int64)
+        self.actions = np.empty(capacity, dtype=np.int32)
+        self.rewards = np.empty(capacity, dtype=np.float32)
+        self.next_states = np.empty(capacity, dtype=np.int64)
+        self.position = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state_row, action_index, reward, next_state_row=-1):
+        """Record one transition"""
+        i = self.position
+        self.states[i] = state_row
+        self.actions[i] = action_index
+        self.rewards[i] = reward
+        self.next_states[i] = next_state_row
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, state_rows, action_indices, rewards, next_state_rows):
+        """Record many transitions at once, e.g. from a recorded log"""
+        n = len(state_rows)
+        if n > self.capacity:
+            # Only the newest transitions would survive anyway
+            state_rows, action_indices = state_rows[-self.capacity:], action_indices[-self.capacity:]
+            rewards, next_state_rows = rewards[-self.capacity:], next_state_rows[-self.capacity:]
+            n = self.capacity
+
+        slots = (self.position + np.arange(n)) % self.capacity
+        self.states[slots] = state_rows
+        self.actions[slots] = action_indices
+        self.rewards[slots] = rewards
+        self.next_states[slots] = next_state_rows
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def sample(self, batch_size):
+        """Sample a minibatch uniformly: (states, actions, rewards, next_states)"""
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        idx = self.rng.integers(0, self.size, size=batch_size)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx]
@@ -0,0 +1,111 @@
+"""
+Shared Q-Table - Cross-app Q-values in universal action category space
+"""
+
+import threading
+import numpy as np
+from rl.normalized_action_space import NormalizedActionSpace
+
+DEFAULT_STRIPES = 16
+
+
+class SharedQTable:
+    """
+    Q-values shared by every agent in a process, stored in a dense float32
+    array of shape (states, universal categories). Agents write the category
+    of each action they take and project rows back onto their own actions,
+    so what one app learns about e.g. RESTART warms up every other app.
+
+    Updates to different states proceed in parallel: each state row is
+    guarded by one of `stripes` locks. Reads take no lock. CUSTOM actions
+    mean something different in every app and are never shared.
+    """
+
+    def __init__(self, categories=None, initial_capacity=1024, stripes=DEFAULT_STRIPES, dtype=np.float32):
+        self.categories = list(categories or NormalizedActionSpace.UNIVERSAL_ACTIONS)
+        self.category_index = {name: i for i, name in enumerate(self.categories)}
+        self.state_index = {}
+        self.state_keys = []
+
+        shape = (max(1, initial_capacity), len(self.categories))
+        self.values = np.zeros(shape, dtype=dtype)
+        self.visited = np.zeros(shape, dtype=bool)
+
+        self._rows_lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(max(1, stripes))]
+
+    def __len__(self):
+        return len(self.state_keys)
+
+    def category_codes(self, categories):
+        """Column of each universal category name, -1 for CUSTOM/unknown"""
+        return np.array([self.category_index.get(c, -1) for c in categories], dtype=np.int64)
+
+    def row(self, key, create=False):
+        """Row index for a state key, or -1 if the state is unknown"""
+        row = self.state_index.get(key, -1)
+        if row >= 0 or not create:
+            return row
+        with self._rows_lock:
+            row = self.state_index.get(key, -1)
+            if row < 0:
+                row = len(self.state_keys)
+                if row == self.values.shape[0]:
+                    self._grow()
+                self.state_keys.append(key)
+                self.state_index[key] = row
+            return row
+
+    def _grow(self):
+        """Double the preallocated rows; holds every stripe so no update is lost"""
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            used = len(self.state_keys)
+            capacity = self.values.shape[0] * 2
+            values = np.zeros((capacity, self.values.shape[1]), dtype=self.values.dtype)
+            visited = np.zeros((capacity, self.values.shape[1]), dtype=bool)
+            values[:used] = self.values[:used]
+            visited[:used] = self.visited[:used]
+            self.values, self.visited = values, visited
+        finally:
+            for lock in reversed(self._stripes):
+                lock.release()
+
+    def max_value(self, key):
+        """Highest recorded Q-value for a state, 0 if nothing was recorded"""
+        row = self.row(key)
+        if row < 0:
+            return 0
+        values, visited = self.values, self.visited
+        if not visited[row].any():
+            return 0
+        return float(values[row][visited[row]].max())
+
+    def update(self, key, category, reward, next_key, learning_rate, discount_factor):
+        """Apply one Q-learning update to a (state, category column) entry"""
+        row = self.row(key, create=True)
+        next_max_q = self.max_value(next_key) if next_key is not None else 0
+
+        with self._stripes[row % len(self._stripes)]:
+            current_q = self.values[row, category]
+            new_q = current_q + learning_rate * (reward + discount_factor * next_max_q - current_q)
+            self.values[row, category] = new_q
+            self.visited[row, category] = True
+        return new_q
+
+    def best_action_index(self, key, action_codes, valid_mask):
+        """
+        Greedy action for an app whose actions map to the category columns
+        action_codes, among those set in valid_mask. -1 if no valid action's
+        category has been recorded for the state.
+        """
+        row = self.row(key)
+        if row < 0:
+            return -1
+        values, visited = self.values, self.visited
+        columns = np.maximum(action_codes, 0)
+        known = visited[row, columns] & (action_codes >= 0) & valid_mask
+        if not known.any():
+            return -1
+        return int(np.argmax(np.where(known, values[row, columns], -np.inf)))
@@ -0,0 +1,62 @@
+"""
+State Encoding - Batch conversion of state dicts to NumPy matrices
+"""
+
+from itertools import islice
+from operator import itemgetter
+import numpy as np
+from rl.app_state_mapper import STATUS_ENCODING, ENV_ENCODING, SEVERITY_ENCODING, STATE_VECTOR_SIZE
+
+BLOCK_SIZE = 8192
+
+_status = itemgetter("status")
+_env = itemgetter("env")
+_error_count = itemgetter("error_count")
+_severity = itemgetter("error_severity")
+_performance = itemgetter("performance_score")
+
+
+def _encode_block(states, out):
+    """Encode a list of states column by column into a preallocated view"""
+    n = len(states)
+    out[:, 0] = np.fromiter(map(STATUS_ENCODING.__getitem__, map(_status, states)), np.float32, n)
+    out[:, 1] = np.fromiter(map(ENV_ENCODING.__getitem__, map(_env, states)), np.float32, n)
+    out[:, 2] = np.fromiter(map(_error_count, states), np.float32, n)
+    out[:, 3] = np.fromiter(map(SEVERITY_ENCODING.__getitem__, map(_severity, states)), np.float32, n)
+    out[:, 4] = np.fromiter(map(_performance, states), np.float32, n)
+    np.minimum(out[:, 2], 10, out=out[:, 2])  # cap at 10
+    out[:, 4] /= 100.0  # normalize to 0-1
+
+
+def states_to_matrix(states, count=None):
+    """
+    Encode state dicts into an (N, 5) float32 matrix, one state_to_vector row
+    per state. Lists are encoded in place in one preallocated matrix; streams
+    are consumed in blocks, into a matrix of `count` rows if given, otherwise
+    one that doubles in size as needed.
+    """
+    if isinstance(states, (list, tuple)):
+        matrix = np.empty((len(states), STATE_VECTOR_SIZE), dtype=np.float32)
+        _encode_block(states, matrix)
+        return matrix
+
+    iterator = iter(states)
+    capacity = count if count is not None else BLOCK_SIZE
+    matrix = np.empty((capacity, STATE_VECTOR_SIZE), dtype=np.float32)
+    rows = 0
+
+    while True:
+        block = list(islice(iterator, BLOCK_SIZE))
+        if not block:
+            break
+
+        if rows + len(block) > capacity:
+            if count is not None:
+                raise ValueError(f"More than count={count} states in stream")
+            capacity = max(capacity * 2, rows + len(block))
+            matrix = np.resize(matrix, (capacity, STATE_VECTOR_SIZE))
+
+        _encode_block(block, matrix[rows:rows + len(block)])
+        rows += len(block)
+
+    return matrix[:rows]
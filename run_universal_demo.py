@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
-import json
 import time
 from universal_rl_agent import UniversalRLAgent
+from rl.event_feed import JsonlEventSink
+from rl.episode_store import EpisodeStore, DEFAULT_STORE_PATH
 
 def simulate_app_logs(scenario="normal"):
     """Generate simulated log lines for different scenarios"""
@@ -42,50 +43,41 @@ def calculate_reward(old_state, new_state, action_result):
     
     return improvement
 
-def run_demo(app_spec_path):
-    """Run a complete demo of the universal RL system"""
-    print(f"Starting Universal RL Demo")
-    print(f"Loading app spec: {app_spec_path}")
-    
-    # Initialize agent
-    agent = UniversalRLAgent(app_spec_path)
-    
-    print(f"Agent initialized for app: {agent.app_spec['name']}")
-    print(f"Available actions: {agent.action_space.action_names}")
-    
-    # Simulation scenarios
-    scenarios = [
-        ("normal", "Normal operation"),
-        ("error", "Error detected"),
-        ("critical", "Critical failure"),
-        ("normal", "Recovery check")
-    ]
-    
+DEMO_SCENARIOS = [
+    ("normal", "Normal operation"),
+    ("error", "Error detected"),
+    ("critical", "Critical failure"),
+    ("normal", "Recovery check")
+]
+
+def run_episode(agent, scenarios=DEMO_SCENARIOS, step_delay=0, log=None):
+    """Drive an agent through the simulated scenarios and return the step results"""
+    log = log or (lambda message: None)
     results = []
     
     for i, (scenario, description) in enumerate(scenarios):
-        print(f"\n--- Step {i+1}: {description} ---")
+        log(f"\n--- Step {i+1}: {description} ---")
         
         # Generate logs for scenario
         logs = simulate_app_logs(scenario)
-        print(f"Logs: {logs[0][:50]}...")
+        log(f"Logs: {logs[0][:50]}...")
         
         # Process logs and get state
         old_state = agent.current_state
         current_state = agent.process_logs(logs)
-        print(f"State: {current_state['status']} (score: {current_state['performance_score']})")
+        log(f"State: {current_state['status']} (score: {current_state['performance_score']})")
         
         # Choose and execute action
         action = agent.choose_action()
         if action:
-            print(f"Chosen action: {action}")
+            log(f"Chosen action: {action}")
             action_result = agent.execute_action(action, dry_run=True)
-            print(f"Action result: {action_result['message']}")
+            log(f"Action result: {action_result['message']}")
             
             # Calculate reward and update
             reward = calculate_reward(old_state, current_state, action_result)
             agent.update_q_value(reward)
-            print(f"Reward: {reward}")
+            log(f"Reward: {reward}")
             
             results.append({
                 "step": i+1,
@@ -96,7 +88,7 @@ def run_demo(app_spec_path):
                 "action_success": action_result['success']
             })
         else:
-            print("No action needed")
+            log("No action needed")
             results.append({
                 "step": i+1,
                 "scenario": scenario,
@@ -106,21 +98,33 @@ def run_demo(app_spec_path):
                 "action_success": True
             })
         
-        time.sleep(1)  # Simulate time passing
+        if step_delay:
+            time.sleep(step_delay)  # Simulate time passing
+    
+    return results
+
+def run_demo(app_spec_path, step_delay=1):
+    """Run a complete demo of the universal RL system"""
+    print(f"Starting Universal RL Demo")
+    print(f"Loading app spec: {app_spec_path}")
+    
+    # Initialize agent
+    agent = UniversalRLAgent(app_spec_path)
+    # Open dashboards show each decision as it happens
+    agent.add_listener(JsonlEventSink())
+    
+    print(f"Agent initialized for app: {agent.app_spec['name']}")
+    print(f"Available actions: {agent.action_space.action_names}")
+    
+    results = run_episode(agent, step_delay=step_delay, log=print)
     
-    # Save results
-    with open('reports/demo_results.json', 'w') as f:
-        json.dump({
-            "app_name": agent.app_spec['name'],
-            "total_steps": len(results),
-            "results": results,
-            "final_policy": agent.get_policy_summary()
-        }, f, indent=2)
+    # Append to the step history instead of overwriting the last run
+    EpisodeStore().append_episode(agent.app_spec['name'], results, agent.q_table.visited_states)
     
     # Summary
     print(f"\nDemo Complete!")
     print(f"Total steps: {len(results)}")
-    print(f"Q-table entries: {len(agent.q_table)}")
+    print(f"Q-table entries: {agent.q_table.visited_states}")
     
     total_reward = sum(r['reward'] for r in results)
     print(f"Total reward: {total_reward}")
@@ -138,7 +142,7 @@ if __name__ == "__main__":
     
     try:
         results = run_demo(spec_path)
-        print(f"\nResults saved to reports/demo_results.json")
+        print(f"\nResults appended to {DEFAULT_STORE_PATH}")
     except Exception as e:
         print(f"Demo failed: {e}")
         sys.exit(1)
\ No newline at end of file
@@ -1,26 +1,24 @@
-import json
-import os
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from rl.episode_store import store_input_paths, load_demo_results, LEGACY_RESULTS_PATH
+from dashboard_server import DashboardServer, LIVE_FEED_SCRIPT, fleet_handler
+from dashboard_cache import RenderCache, send_page
+from dashboard_api import AppRegistry, APP_LIST_SCRIPT, DEFAULT_SPEC_DIR, EXTRA_SPECS
 import webbrowser
-import threading
+
+# Table rows load from /api/apps
+APP_REGISTRY = AppRegistry()
+
+# Everything create_html() reads; the spec directory's mtime covers added or removed specs
+DASHBOARD_INPUTS = [DEFAULT_SPEC_DIR] + list(EXTRA_SPECS) + store_input_paths() + [LEGACY_RESULTS_PATH]
+DASHBOARD_PATHS = ('/', '/dashboard', '/dashboard.html')
 
 def load_data():
     data = {"apps": [], "results": None}
     
-    # Load app specs
-    if os.path.exists('spec/example_app_spec.json'):
-        with open('spec/example_app_spec.json', 'r') as f:
-            data["apps"].append({"name": "Flask Example", "spec": json.load(f)})
-    
-    if os.path.exists('app_spec.generated.json'):
-        with open('app_spec.generated.json', 'r') as f:
-            spec = json.load(f)
-            data["apps"].append({"name": spec["name"], "spec": spec})
+    # Summaries only; the page fetches rows lazily
+    data["apps"] = APP_REGISTRY.page_apps()
     
     # Load results
-    if os.path.exists('reports/demo_results.json'):
-        with open('reports/demo_results.json', 'r') as f:
-            data["results"] = json.load(f)
+    data["results"] = load_demo_results()
     
     return data
 
@@ -45,8 +43,6 @@ def create_html():
         table { width: 100%; border-collapse: collapse; }
         th, td { padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }
         th { background: #ecf0f1; }
-        .refresh-btn { background: #3498db; color: white; padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; }
-        .refresh-btn:hover { background: #2980b9; }
     </style>
 </head>
 <body>
@@ -82,31 +78,16 @@ def create_html():
         <div class="card">
             <h2>Applications</h2>
             <table>
-                <tr>
-                    <th>Name</th>
-                    <th>Type</th>
-                    <th>Port</th>
-                    <th>Actions</th>
-                    <th>Status</th>
-                </tr>
-"""
-    
-    for app in data["apps"]:
-        spec = app["spec"]
-        status = "Active" if data["results"] and data["results"]["app_name"] == spec["name"] else "Inactive"
-        status_class = "status-good" if status == "Active" else "status-bad"
-        
-        html += f"""
-                <tr>
-                    <td>{spec["name"]}</td>
-                    <td>{spec["type"]}</td>
-                    <td>{spec["port"]}</td>
-                    <td>{len(spec["available_actions"])}</td>
-                    <td class="{status_class}">{status}</td>
-                </tr>
-"""
-    
-    html += """
+                <thead>
+                    <tr>
+                        <th>Name</th>
+                        <th>Type</th>
+                        <th>Port</th>
+                        <th>Actions</th>
+                        <th>Status</th>
+                    </tr>
+                </thead>
+                <tbody data-app-list data-app-render="renderAppRow"></tbody>
             </table>
         </div>
 """
@@ -144,7 +125,39 @@ def create_html():
     
     html += """
         <div class="card">
-            <button class="refresh-btn" onclick="location.reload()">Refresh Dashboard</button>
+            <h2>Live Agent Feed <span class="metric-label" data-live="connection">Connecting...</span></h2>
+            <div class="metric">
+                <div class="metric-value" data-live="app">-</div>
+                <div class="metric-label">Current App</div>
+            </div>
+            <div class="metric">
+                <div class="metric-value" data-live="status">-</div>
+                <div class="metric-label">Current State</div>
+            </div>
+            <div class="metric">
+                <div class="metric-value" data-live="action">-</div>
+                <div class="metric-label">Last Action</div>
+            </div>
+            <div class="metric">
+                <div class="metric-value" data-live="total-reward">0</div>
+                <div class="metric-label">Live Reward (<span data-live="steps">0</span> steps)</div>
+            </div>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Time</th>
+                        <th>App</th>
+                        <th>Status</th>
+                        <th>Action</th>
+                        <th>Reward</th>
+                        <th>Performance</th>
+                    </tr>
+                </thead>
+                <tbody data-live-log="20"></tbody>
+            </table>
+        </div>
+        
+        <div class="card">
             <p><strong>Commands:</strong></p>
             <ul>
                 <li><code>python run_universal_demo.py</code> - Run RL demo</li>
@@ -153,6 +166,19 @@ def create_html():
             </ul>
         </div>
     </div>
+    <script>
+        function renderAppRow(app) {
+            var active = app.status === 'active';
+            return '<tr>' +
+                '<td>' + escapeHtml(app.name) + '</td>' +
+                '<td>' + escapeHtml(app.type) + '</td>' +
+                '<td>' + escapeHtml(app.port) + '</td>' +
+                '<td>' + escapeHtml(app.actions) + '</td>' +
+                '<td class="' + (active ? 'status-good' : 'status-bad') + '">' + (active ? 'Active' : 'Inactive') + '</td>' +
+                '</tr>';
+        }
+    </script>
+""" + LIVE_FEED_SCRIPT + APP_LIST_SCRIPT + """
 </body>
 </html>
 """
@@ -160,23 +186,22 @@ def create_html():
     return html
 
 def start_server():
-    # Create HTML file
-    html_content = create_html()
-    with open('dashboard.html', 'w') as f:
-        f.write(html_content)
+    # The page is rendered in memory and only re-rendered when an input changes
+    page_cache = RenderCache(create_html, DASHBOARD_INPUTS)
     
     # Start server
-    class Handler(SimpleHTTPRequestHandler):
+    class Handler(fleet_handler(APP_REGISTRY)):
         def do_GET(self):
-            if self.path == '/' or self.path == '/dashboard':
-                self.path = '/dashboard.html'
-                # Regenerate HTML on each request
-                html_content = create_html()
-                with open('dashboard.html', 'w') as f:
-                    f.write(html_content)
-            return SimpleHTTPRequestHandler.do_GET(self)
+            if self.path in DASHBOARD_PATHS:
+                return send_page(self, page_cache.get())
+            return super().do_GET()
+        
+        def do_HEAD(self):
+            if self.path in DASHBOARD_PATHS:
+                return send_page(self, page_cache.get(), head_only=True)
+            return super().do_HEAD()
     
-    server = HTTPServer(('localhost', 8080), Handler)
+    server = DashboardServer(('localhost', 8080), Handler)
     print("Dashboard running at: http://localhost:8080")
     print("Press Ctrl+C to stop")
     
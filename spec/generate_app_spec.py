@@ -1,10 +1,85 @@
+import codecs
 import os
 import json
 import re
 
-def detect_app_type(repo_path):
+# Next to this module, so scans work from any working directory
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.scan_cache.json')
+PACKAGE_PORT_PATTERN = re.compile(r'port.*?(\d{4})')
+PYTHON_PORT_PATTERN = re.compile(r'port=(\d{4})')
+
+READ_CHUNK_SIZE = 64 * 1024
+MAX_FILE_SCAN_BYTES = 256 * 1024      # per-file read budget for port detection
+MAX_PACKAGE_JSON_BYTES = 1 << 20      # larger package.json files are not parsed
+MAX_LINE_CARRY = 4096                 # longest partial line kept between chunks
+
+def scan_directory(repo_path):
+    """List a repo once with os.scandir: {name: (is_dir, mtime_ns, size)} in directory order"""
+    listing = {}
+    with os.scandir(repo_path) as entries:
+        for entry in entries:
+            try:
+                stat = entry.stat()
+                listing[entry.name] = (entry.is_dir(), stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+    return listing
+
+def search_file(path, pattern, budget=MAX_FILE_SCAN_BYTES):
+    """
+    First match of a single-line pattern in a text file, streamed in chunks
+    and reading at most budget bytes. Binary files (NUL bytes) give None.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    carry = ''
+    remaining = budget
+    try:
+        with open(path, 'rb') as f:
+            while remaining > 0:
+                chunk = f.read(min(READ_CHUNK_SIZE, remaining))
+                if not chunk or b'\0' in chunk:
+                    return None
+                remaining -= len(chunk)
+                
+                text = carry + decoder.decode(chunk)
+                match = pattern.search(text)
+                if match:
+                    return match
+                # Matches never span lines: only the unfinished last line carries over
+                carry = text[text.rfind('\n') + 1:][-MAX_LINE_CARRY:]
+    except OSError:
+        return None
+    return None
+
+def analyze_file(path):
+    """Facts detection needs from one file: port, and scripts for package.json"""
+    if os.path.basename(path) == 'package.json':
+        scripts = {}
+        if os.path.getsize(path) <= MAX_PACKAGE_JSON_BYTES:
+            with open(path, 'r') as f:
+                scripts = json.load(f).get('scripts', {})
+        port_match = search_file(path, PACKAGE_PORT_PATTERN)
+        return {
+            "scripts": scripts,
+            "port": int(port_match.group(1)) if port_match else None
+        }
+    
+    port_match = search_file(path, PYTHON_PORT_PATTERN)
+    return {"port": int(port_match.group(1)) if port_match else None}
+
+def file_result(repo_path, name, listing, cache):
+    """analyze_file() result, reused from cache while the file's mtime and size are unchanged"""
+    _, mtime, size = listing[name]
+    cached = cache.get(name)
+    if cached and cached[0] == mtime and cached[1] == size:
+        return cached[2]
+    result = analyze_file(os.path.join(repo_path, name))
+    cache[name] = [mtime, size, result]
+    return result
+
+def detect_app_type(repo_path, listing=None):
     """Detect if app is frontend, backend, or fullstack"""
-    files = os.listdir(repo_path)
+    files = listing if listing is not None else scan_directory(repo_path)
     
     has_frontend = any(f in files for f in ['package.json', 'index.html', 'src'])
     has_backend = any(f in files for f in ['requirements.txt', 'app.py', 'server.js', 'main.py'])
@@ -18,8 +93,10 @@ def detect_app_type(repo_path):
     else:
         return "unknown"
 
-def extract_commands(repo_path, app_type):
+def extract_commands(repo_path, app_type, listing=None, cache=None):
     """Extract build/start commands based on detected files"""
+    listing = listing if listing is not None else scan_directory(repo_path)
+    cache = cache if cache is not None else {}
     commands = {
         "build_command": "",
         "start_command": "",
@@ -27,67 +104,69 @@ def extract_commands(repo_path, app_type):
     }
     
     # Check for package.json (Node.js)
-    package_json_path = os.path.join(repo_path, 'package.json')
-    if os.path.exists(package_json_path):
-        with open(package_json_path, 'r') as f:
-            package_data = json.load(f)
-            scripts = package_data.get('scripts', {})
-            commands["build_command"] = scripts.get('build', 'npm run build')
-            commands["start_command"] = scripts.get('start', 'npm start')
-            commands["install_command"] = "npm install"
+    if 'package.json' in listing:
+        scripts = file_result(repo_path, 'package.json', listing, cache)['scripts']
+        commands["build_command"] = scripts.get('build', 'npm run build')
+        commands["start_command"] = scripts.get('start', 'npm start')
+        commands["install_command"] = "npm install"
     
     # Check for requirements.txt (Python)
-    elif os.path.exists(os.path.join(repo_path, 'requirements.txt')):
+    elif 'requirements.txt' in listing:
         commands["install_command"] = "pip install -r requirements.txt"
         
         # Look for main Python file
-        python_files = [f for f in os.listdir(repo_path) if f.endswith('.py')]
+        python_files = [f for f in listing if f.endswith('.py')]
         main_file = next((f for f in python_files if 'app' in f or 'main' in f), python_files[0] if python_files else 'app.py')
         commands["start_command"] = f"python {main_file}"
         commands["build_command"] = "pip install -r requirements.txt"
     
     # Check for Dockerfile
-    elif os.path.exists(os.path.join(repo_path, 'Dockerfile')):
+    elif 'Dockerfile' in listing:
         commands["build_command"] = "docker build -t app ."
         commands["start_command"] = "docker run -p 8000:8000 app"
         commands["install_command"] = "docker build -t app ."
     
     return commands
 
-def detect_port(repo_path):
+def detect_port(repo_path, listing=None, cache=None):
     """Try to detect default port from common files"""
+    listing = listing if listing is not None else scan_directory(repo_path)
+    cache = cache if cache is not None else {}
     port = 8000  # default
     
     # Check package.json
-    package_json_path = os.path.join(repo_path, 'package.json')
-    if os.path.exists(package_json_path):
-        with open(package_json_path, 'r') as f:
-            content = f.read()
-            port_match = re.search(r'port.*?(\d{4})', content)
-            if port_match:
-                port = int(port_match.group(1))
+    package_port = None
+    if 'package.json' in listing:
+        package_port = file_result(repo_path, 'package.json', listing, cache)['port']
+        if package_port:
+            port = package_port
     
     # Check Python files for Flask/FastAPI
-    for file in os.listdir(repo_path):
-        if file.endswith('.py'):
-            try:
-                with open(os.path.join(repo_path, file), 'r') as f:
-                    content = f.read()
-                    port_match = re.search(r'port=(\d{4})', content)
-                    if port_match:
-                        port = int(port_match.group(1))
-                        break
-            except:
-                continue
+    for file, (is_dir, _, _) in listing.items():
+        if file.endswith('.py') and not is_dir:
+            python_port = file_result(repo_path, file, listing, cache)['port']
+            if python_port:
+                return python_port
     
     return port
 
-def generate_app_spec(repo_path):
-    """Generate app spec from repository analysis"""
+def generate_app_spec(repo_path, cache=None):
+    """
+    Generate app spec from repository analysis. The repo is listed once;
+    cache maps file names to [mtime_ns, size, result] and is updated in
+    place, so a rescan only re-reads files that changed.
+    """
+    cache = cache if cache is not None else {}
+    listing = scan_directory(repo_path)
+    for name in list(cache):
+        top = name.split(os.sep, 1)[0]
+        if top not in listing or (top != name and not os.path.exists(os.path.join(repo_path, name))):
+            del cache[name]
+    
     repo_name = os.path.basename(repo_path)
-    app_type = detect_app_type(repo_path)
-    commands = extract_commands(repo_path, app_type)
-    port = detect_port(repo_path)
+    app_type = detect_app_type(repo_path, listing)
+    commands = extract_commands(repo_path, app_type, listing, cache)
+    port = detect_port(repo_path, listing, cache)
     
     spec = {
         "name": repo_name,
@@ -129,24 +208,115 @@ def generate_app_spec(repo_path):
     
     return spec
 
-if __name__ == "__main__":
-    import sys
+def load_scan_cache(cache_path=DEFAULT_CACHE_PATH):
+    """Per-repo file caches from earlier scans: {repo_abspath: {file: [mtime_ns, size, result]}}"""
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_scan_cache(cache, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Atomically write the scan cache. The cache only speeds up later scans,
+    so a failed write is reported and returns False instead of raising.
+    """
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+        return True
+    except OSError as e:
+        print(f"Warning: could not save scan cache {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+def scan_repo(job):
+    """Worker: (repo_path, file_cache) -> (spec or None, file_cache, error or None)"""
+    repo_path, cache = job
+    try:
+        return generate_app_spec(repo_path, cache), cache, None
+    except Exception as e:
+        return None, cache, str(e)
+
+def scan_repos(repo_paths, output_dir='spec', names=None, cache_path=DEFAULT_CACHE_PATH, max_workers=None):
+    """
+    Generate one spec per repo, written to <output_dir>/<name>_spec.json.
+    Repos are scanned in parallel on a process pool and per-file results
+    are cached across runs. Returns {name: {"status", "spec_file" or "error"}}.
+    """
+    from concurrent.futures import ProcessPoolExecutor
     
-    if len(sys.argv) != 2:
-        print("Usage: python generate_app_spec.py <repo_path>")
-        sys.exit(1)
+    names = names or [os.path.basename(os.path.normpath(p)) for p in repo_paths]
+    cache = load_scan_cache(cache_path) if cache_path else {}
+    keys = [os.path.abspath(p) for p in repo_paths]
+    jobs = [(path, cache.get(key, {})) for path, key in zip(repo_paths, keys)]
+    
+    if len(jobs) > 1 and max_workers != 1:
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(scan_repo, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        outputs = [scan_repo(job) for job in jobs]
     
-    repo_path = sys.argv[1]
+    results = {}
+    os.makedirs(output_dir, exist_ok=True)
+    for name, key, (spec, repo_cache, error) in zip(names, keys, outputs):
+        cache[key] = repo_cache
+        if error:
+            results[name] = {"status": "FAIL", "error": error}
+            continue
+        spec_file = os.path.join(output_dir, f"{name}_spec.json")
+        with open(spec_file, 'w') as f:
+            json.dump(spec, f, indent=2)
+        results[name] = {"status": "PASS", "spec_file": spec_file, "type": spec["type"]}
     
-    if not os.path.exists(repo_path):
-        print(f"Error: Path {repo_path} does not exist")
-        sys.exit(1)
+    if cache_path:
+        save_scan_cache(cache, cache_path)
+    return results
+
+def main(repo_paths, output_file="app_spec.generated.json"):
+    """
+    Scan repos from the command line: one repo is written to output_file,
+    several get one spec each under spec/. Returns the exit status.
+    """
+    for repo_path in repo_paths:
+        if not os.path.exists(repo_path):
+            print(f"Error: Path {repo_path} does not exist")
+            return 1
+    
+    if len(repo_paths) > 1:
+        # Many repos: one spec each under spec/
+        results = scan_repos(repo_paths)
+        for name, result in results.items():
+            print(f"{name}: {result.get('spec_file') or result['error']}")
+        return 0 if all(r["status"] == "PASS" for r in results.values()) else 1
     
-    spec = generate_app_spec(repo_path)
+    repo_path = repo_paths[0]
+    cache = load_scan_cache()
+    repo_cache = cache.get(os.path.abspath(repo_path), {})
+    spec = generate_app_spec(repo_path, repo_cache)
     
-    output_file = "app_spec.generated.json"
     with open(output_file, 'w') as f:
         json.dump(spec, f, indent=2)
     
+    cache[os.path.abspath(repo_path)] = repo_cache
+    save_scan_cache(cache)
+    
     print(f"Generated app spec saved to {output_file}")
-    print(f"Detected app type: {spec['type']}")
\ No newline at end of file
+    print(f"Detected app type: {spec['type']}")
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) < 2:
+        print("Usage: python generate_app_spec.py <repo_path> [<repo_path> ...]")
+        sys.exit(1)
+    
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,99 @@
+"""
+Streamlit Cache - File-change aware loaders for the Streamlit dashboards
+
+Streamlit reruns the whole script on every widget interaction. The loaders
+here take a file signature ((path, mtime_ns, size) per input) as their
+cache key, so a rerun costs one stat() per input file and files are parsed,
+and DataFrames built, only after an input changes. cache_resource hands
+back the cached object itself instead of a copy, so callers must treat
+results as read-only.
+"""
+
+import json
+import pandas as pd
+import streamlit as st
+from dashboard_cache import file_signature
+from rl.episode_store import store_input_paths, load_demo_results, LEGACY_RESULTS_PATH
+
+MAX_CACHED_FILES = 64
+MAX_CACHED_RESULTS = 4
+
+# Everything load_demo_results() reads
+RESULT_INPUTS = store_input_paths() + [LEGACY_RESULTS_PATH]
+
+ACTION_COMMAND_WIDTH = 50
+
+
+@st.cache_resource(max_entries=MAX_CACHED_FILES, show_spinner=False)
+def _read_json(signature):
+    (path, _, _), = signature
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_json(path):
+    """Parsed JSON file, None if it is missing or invalid"""
+    signature = file_signature([path])
+    if signature[0][1] is None:
+        return None
+    try:
+        return _read_json(signature)
+    except (OSError, ValueError):
+        return None
+
+
+@st.cache_resource(max_entries=MAX_CACHED_FILES, show_spinner=False)
+def _spec_frames(signature):
+    spec = _read_json(signature)
+    details = pd.DataFrame([
+        ["Type", spec['type']],
+        ["Version", spec['version']],
+        ["Port", spec['port']],
+        ["Start Command", spec['start_command']],
+        ["Build Command", spec['build_command']]
+    ], columns=["Property", "Value"])
+
+    actions = pd.DataFrame([
+        [
+            action['name'],
+            action['risk_level'],
+            action['command'][:ACTION_COMMAND_WIDTH] + "..." if len(action['command']) > ACTION_COMMAND_WIDTH
+            else action['command']
+        ]
+        for action in spec['available_actions']
+    ], columns=["Action", "Risk Level", "Command"])
+    return details, actions
+
+
+def spec_frames(path):
+    """(details, actions) DataFrames for an app spec file"""
+    return _spec_frames(file_signature([path]))
+
+
+@st.cache_resource(max_entries=MAX_CACHED_RESULTS, show_spinner=False)
+def _latest_results(signature):
+    return load_demo_results()
+
+
+def latest_results():
+    """Latest episode in demo_results.json shape, None if nothing was recorded"""
+    return _latest_results(file_signature(RESULT_INPUTS))
+
+
+@st.cache_resource(max_entries=MAX_CACHED_RESULTS, show_spinner=False)
+def _results_frame(signature):
+    results = _latest_results(signature)
+    steps = results['results'] if results else []
+    return pd.DataFrame({
+        'Step': [r['step'] for r in steps],
+        'Scenario': pd.Categorical([r['scenario'] for r in steps]),
+        'Status': pd.Categorical([r['state']['status'] for r in steps]),
+        'Action': pd.Categorical([r['action'] for r in steps]),
+        'Performance': [r['state']['performance_score'] for r in steps],
+        'Reward': [r['reward'] for r in steps]
+    })
+
+
+def results_frame():
+    """Steps of the latest episode as a DataFrame for the performance and reward charts"""
+    return _results_frame(file_signature(RESULT_INPUTS))
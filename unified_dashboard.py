@@ -1,53 +1,37 @@
-import json
 import os
-import subprocess
-import sys
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from rl.episode_store import load_demo_results
+from dashboard_server import DashboardServer, LIVE_FEED_SCRIPT, fleet_handler
+from dashboard_api import AppRegistry, APP_LIST_SCRIPT
+from job_queue import JobQueue
 import webbrowser
-import threading
 
-def load_all_apps():
-    apps = {}
-    
-    # Backend specs
-    if os.path.exists('spec/example_app_spec.json'):
-        with open('spec/example_app_spec.json', 'r') as f:
-            apps['flask-backend'] = json.load(f)
-    
-    if os.path.exists('app_spec.generated.json'):
-        with open('app_spec.generated.json', 'r') as f:
-            apps['coinx-backend'] = json.load(f)
-    
-    # Frontend specs
-    if os.path.exists('spec/frontend_app_spec.json'):
-        with open('spec/frontend_app_spec.json', 'r') as f:
-            apps['coinx-frontend'] = json.load(f)
-    
-    return apps
+# Quick action buttons; any registered app can also be run by name
+SPEC_FILES = {
+    'flask-backend': 'spec/example_app_spec.json',
+    'coinx-backend': 'app_spec.generated.json',
+    'coinx-frontend': 'spec/frontend_app_spec.json'
+}
+
+APP_REGISTRY = AppRegistry()
+
+def spec_file_for(app_key):
+    """Spec path for a quick action key or a registered app name"""
+    return SPEC_FILES.get(app_key) or APP_REGISTRY.spec_path(app_key)
 
 def load_results():
-    if os.path.exists('reports/demo_results.json'):
-        with open('reports/demo_results.json', 'r') as f:
-            return json.load(f)
-    return None
+    return load_demo_results()
 
-def run_demo_for_app(app_key, apps):
-    """Run demo for specific app"""
-    spec_files = {
-        'flask-backend': 'spec/example_app_spec.json',
-        'coinx-backend': 'app_spec.generated.json',
-        'coinx-frontend': 'spec/frontend_app_spec.json'
-    }
+def run_demo_for_app(app_key):
+    """Run one demo episode for an app in-process; raises if it fails"""
+    from fleet_runner import run_live_demo
     
-    spec_file = spec_files.get(app_key)
-    if spec_file and os.path.exists(spec_file):
-        result = subprocess.run([sys.executable, "run_universal_demo.py", spec_file], 
-                              capture_output=True)
-        return result.returncode == 0
-    return False
+    spec_file = spec_file_for(app_key)
+    if not spec_file or not os.path.exists(spec_file):
+        raise ValueError(f"No app spec for {app_key}")
+    return run_live_demo(spec_file)
 
 def create_unified_html():
-    apps = load_all_apps()
+    apps, _ = APP_REGISTRY.refresh()
     results = load_results()
     
     html = """
@@ -101,15 +85,54 @@ def create_unified_html():
                 <button class="run-btn backend-btn" onclick="runDemo('coinx-backend')">🔧 Test Backend RL</button>
                 <button class="run-btn frontend-btn" onclick="runDemo('coinx-frontend')">🎨 Test Frontend RL</button>
                 <button class="run-btn" onclick="runDemo('flask-backend')">⚡ Test Flask Demo</button>
-                <button class="run-btn" onclick="location.reload()">🔄 Refresh Dashboard</button>
             </div>
+            <div id="job-status" class="metric-label" style="text-align: center;"></div>
+        </div>
+        
+        <div class="section">
+            <h2>📡 Live Agent Feed <span class="metric-label" data-live="connection">⚪ Connecting...</span></h2>
+            <div class="metrics">
+                <div class="metric">
+                    <div class="metric-value" data-live="app">-</div>
+                    <div class="metric-label">Current App</div>
+                </div>
+                <div class="metric">
+                    <div class="metric-value" data-live="status">-</div>
+                    <div class="metric-label">Current State</div>
+                </div>
+                <div class="metric">
+                    <div class="metric-value" data-live="action">-</div>
+                    <div class="metric-label">Last Action</div>
+                </div>
+                <div class="metric">
+                    <div class="metric-value" data-live="reward">-</div>
+                    <div class="metric-label">Last Reward</div>
+                </div>
+                <div class="metric">
+                    <div class="metric-value" data-live="total-reward">0</div>
+                    <div class="metric-label">Live Reward (<span data-live="steps">0</span> steps)</div>
+                </div>
+            </div>
+            <table class="results-table">
+                <thead>
+                    <tr>
+                        <th>Time</th>
+                        <th>App</th>
+                        <th>Status</th>
+                        <th>Action</th>
+                        <th>Reward</th>
+                        <th>Performance</th>
+                    </tr>
+                </thead>
+                <tbody data-live-log="20"></tbody>
+            </table>
         </div>
         
         <div class="section">
             <h2>📊 System Overview</h2>
             <div class="metrics">
                 <div class="metric">
-                    <div class="metric-value">""" + str(len(apps)) + """</div>
+                    <div class="metric-value" data-summary="apps">""" + str(len(apps)) + """</div>
                     <div class="metric-label">Total Apps</div>
                 </div>
 """
@@ -117,15 +140,15 @@ def create_unified_html():
     if results:
         html += f"""
                 <div class="metric">
-                    <div class="metric-value">{results["total_steps"]}</div>
+                    <div class="metric-value" data-latest="total_steps">{results["total_steps"]}</div>
                     <div class="metric-label">Last Demo Steps</div>
                 </div>
                 <div class="metric">
-                    <div class="metric-value">{sum(r['reward'] for r in results["results"])}</div>
+                    <div class="metric-value" data-latest="total_reward">{sum(r['reward'] for r in results["results"])}</div>
                     <div class="metric-label">Total Reward</div>
                 </div>
                 <div class="metric">
-                    <div class="metric-value">{results["app_name"]}</div>
+                    <div class="metric-value" data-latest="app_name">{results["app_name"]}</div>
                     <div class="metric-label">Active App</div>
                 </div>
 """
@@ -136,33 +159,10 @@ def create_unified_html():
         
         <div class="section">
             <h2>🏗️ Applications</h2>
-            <div class="app-grid">
-"""
-    
-    for app_key, app_spec in apps.items():
-        app_type = app_spec['type']
-        is_active = results and results['app_name'] == app_spec['name']
-        status_class = "status-active" if is_active else "status-inactive"
-        status_text = "🟢 Active" if is_active else "⚪ Inactive"
-        
-        html += f"""
-                <div class="app-card {app_type}">
-                    <div class="app-title">{app_spec['name']}</div>
-                    <span class="app-type type-{app_type}">{app_type}</span>
-                    <div style="margin: 15px 0;">
-                        <strong>Port:</strong> {app_spec['port']}<br>
-                        <strong>Actions:</strong> {len(app_spec['available_actions'])}<br>
-                        <strong>Status:</strong> <span class="{status_class}">{status_text}</span>
-                    </div>
-                    <div>
-                        <strong>Start Command:</strong><br>
-                        <code style="background: #f8f9fa; padding: 5px; border-radius: 3px; font-size: 12px;">{app_spec['start_command']}</code>
-                    </div>
-                </div>
+            <div class="app-grid" data-app-list data-app-render="renderAppCard"></div>
 """
     
     html += """
-            </div>
         </div>
 """
     
@@ -209,14 +209,90 @@ def create_unified_html():
     </div>
     
     <script>
+        function renderAppCard(app) {
+            var type = escapeHtml(app.type);
+            var active = app.status === 'active';
+            return '<div class="app-card ' + type + '">' +
+                '<div class="app-title">' + escapeHtml(app.name) + '</div>' +
+                '<span class="app-type type-' + type + '">' + type + '</span>' +
+                '<div style="margin: 15px 0;">' +
+                '<strong>Port:</strong> ' + escapeHtml(app.port) + '<br>' +
+                '<strong>Actions:</strong> ' + escapeHtml(app.actions) + '<br>' +
+                '<strong>Status:</strong> <span class="' + (active ? 'status-active' : 'status-inactive') + '">' +
+                (active ? '🟢 Active' : '⚪ Inactive') + '</span>' +
+                '</div>' +
+                '<div>' +
+                '<strong>Start Command:</strong><br>' +
+                '<code style="background: #f8f9fa; padding: 5px; border-radius: 3px; font-size: 12px;">' +
+                escapeHtml(app.start_command) + '</code>' +
+                '</div>' +
+                '<button class="run-btn" data-app="' + escapeHtml(app.name) + '" onclick="runDemo(this.dataset.app)">▶️ Run RL Demo</button>' +
+                '</div>';
+        }
+        
+        function showJob(text) {
+            document.getElementById('job-status').textContent = text;
+        }
+        
+        function setMetrics(attribute, values) {
+            document.querySelectorAll('[' + attribute + ']').forEach(function (el) {
+                var value = values[el.getAttribute(attribute)];
+                if (value !== undefined) el.textContent = value;
+            });
+        }
+        
+        function showResult(job) {
+            // The decisions already arrived over /events; only the totals are refreshed
+            fetch('/api/jobs/' + job.id + '/result').then(function (response) {
+                return response.json();
+            }).then(function (job) {
+                var result = job.result || {};
+                showJob('✅ ' + job.key + ' demo finished: ' + result.total_steps + ' steps, reward ' + result.total_reward);
+                setMetrics('data-latest', result);
+            });
+            fetch('/api/summary').then(function (response) {
+                return response.json();
+            }).then(function (summary) {
+                setMetrics('data-summary', summary);
+            });
+        }
+        
+        function pollJob(job) {
+            fetch('/api/jobs/' + job.id).then(function (response) {
+                return response.json();
+            }).then(function (job) {
+                if (job.status === 'queued' || job.status === 'running') {
+                    showJob('⏳ ' + job.key + ' demo ' + job.status + '...');
+                    setTimeout(function () { pollJob(job); }, 1000);
+                } else if (job.status === 'done') {
+                    showJob('✅ ' + job.key + ' demo finished');
+                    showResult(job);
+                } else {
+                    showJob('❌ ' + job.key + ' demo failed: ' + job.error);
+                }
+            });
+        }
+        
         function runDemo(appType) {
-            alert('Running RL demo for ' + appType + '... Check console for progress!');
-            // In a real implementation, this would trigger the Python script
-            setTimeout(() => {
-                location.reload();
-            }, 3000);
+            // Runs in the background; decisions appear in the live feed
+            fetch('/api/jobs', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({app: appType})
+            }).then(function (response) {
+                return response.json();
+            }).then(function (job) {
+                if (job.error && !job.id) {
+                    showJob('❌ ' + job.error);
+                } else {
+                    pollJob(job);
+                }
+            }).catch(function () {
+                showJob('❌ Could not reach the dashboard');
+            });
         }
     </script>
+""" + LIVE_FEED_SCRIPT + APP_LIST_SCRIPT + """
 </body>
 </html>
 """
@@ -224,18 +300,16 @@ def create_unified_html():
     return html
 
 def start_unified_server():
-    class Handler(SimpleHTTPRequestHandler):
+    jobs = JobQueue(run_demo_for_app)
+    
+    class Handler(fleet_handler(APP_REGISTRY, jobs, accept_job=spec_file_for)):
         def do_GET(self):
             if self.path == '/' or self.path == '/dashboard':
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html')
-                self.end_headers()
-                html_content = create_unified_html()
-                self.wfile.write(html_content.encode())
+                self.send_html(create_unified_html())
             else:
                 super().do_GET()
     
-    server = HTTPServer(('localhost', 8080), Handler)
+    server = DashboardServer(('localhost', 8080), Handler)
     print("🚀 Unified Dashboard running at: http://localhost:8080")
     print("📊 Frontend & Backend RL Management Ready!")
     print("Press Ctrl+C to stop")
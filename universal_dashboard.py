@@ -1,23 +1,22 @@
 import streamlit as st
-import json
-import os
-import pandas as pd
+from streamlit_cache import load_json, spec_frames, latest_results
+
+SPEC_PATHS = {
+    'example-flask-api': 'spec/example_app_spec.json',
+    'generated-backend': 'app_spec.generated.json'
+}
 
 def load_app_specs():
+    """Specs by key; parsed again only when a spec file changes"""
     specs = {}
-    if os.path.exists('spec/example_app_spec.json'):
-        with open('spec/example_app_spec.json', 'r') as f:
-            specs['example-flask-api'] = json.load(f)
-    if os.path.exists('app_spec.generated.json'):
-        with open('app_spec.generated.json', 'r') as f:
-            specs['generated-backend'] = json.load(f)
+    for key, path in SPEC_PATHS.items():
+        spec = load_json(path)
+        if spec is not None:
+            specs[key] = spec
     return specs
 
 def load_demo_results():
-    if os.path.exists('reports/demo_results.json'):
-        with open('reports/demo_results.json', 'r') as f:
-            return json.load(f)
-    return None
+    return latest_results()
 
 def main():
     st.set_page_config(page_title="Universal RL Dashboard", layout="wide")
@@ -41,27 +40,13 @@ def main():
         with col1:
             st.header(f"App: {app_spec['name']}")
             
+            details_df, actions_df = spec_frames(SPEC_PATHS[selected_app])
+            
             st.subheader("Application Details")
-            details_df = pd.DataFrame([
-                ["Type", app_spec['type']],
-                ["Version", app_spec['version']],
-                ["Port", app_spec['port']],
-                ["Start Command", app_spec['start_command']],
-                ["Build Command", app_spec['build_command']]
-            ], columns=["Property", "Value"])
             st.table(details_df)
             
             st.subheader("Available Actions")
-            actions_data = []
-            for action in app_spec['available_actions']:
-                actions_data.append([
-                    action['name'],
-                    action['risk_level'],
-                    action['command'][:50] + "..." if len(action['command']) > 50 else action['command']
-                ])
-            
-            if actions_data:
-                actions_df = pd.DataFrame(actions_data, columns=["Action", "Risk Level", "Command"])
+            if not actions_df.empty:
                 st.table(actions_df)
         
         with col2:
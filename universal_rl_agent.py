@@ -1,31 +1,64 @@
 import json
 import random
-import numpy as np
-from rl.app_state_mapper import AppStateMapper
+from rl.app_state_mapper import AppStateMapper, SlidingWindowStateMapper
 from rl.app_action_space import AppActionSpace
+from rl.log_follower import LogFollower
+from rl.q_table import ArrayQTable, state_key as make_state_key
+from rl.replay_buffer import ReplayBuffer
+from rl.policy_file import save_binary_policy, load_binary_policy, is_binary_policy
+from rl.event_feed import transition_event
+from rl.normalized_action_space import get_normalized_space
 
 class UniversalRLAgent:
-    def __init__(self, app_spec_path):
+    def __init__(self, app_spec_path, window_seconds=None, window_lines=None, q_table=None,
+                 replay_capacity=0, shared_q_table=None):
         with open(app_spec_path, 'r') as f:
             self.app_spec = json.load(f)
         
-        self.state_mapper = AppStateMapper(self.app_spec)
+        # With a window, states come from running counters instead of per-batch rescans
+        if window_seconds is not None or window_lines is not None:
+            self.state_mapper = SlidingWindowStateMapper(self.app_spec, window_seconds, window_lines)
+        else:
+            self.state_mapper = AppStateMapper(self.app_spec)
         self.action_space = AppActionSpace(self.app_spec)
         
-        # Simple Q-table for demonstration
-        self.q_table = {}
+        # Dense Q-table: one row per discretized state, one column per action
+        self.q_table = q_table if q_table is not None else ArrayQTable(self.action_space.action_names)
         self.learning_rate = 0.1
         self.discount_factor = 0.9
         self.epsilon = 0.1
         
+        # Optional SharedQTable: learned in universal categories, read when this app has no Q-values yet
+        self.shared_q_table = shared_q_table
+        if shared_q_table is not None:
+            space = get_normalized_space(self.app_spec)
+            self.action_codes = shared_q_table.category_codes(
+                space.get_universal_category(name) for name in self.action_space.action_names)
+        
+        # Transitions are only recorded for replay when a capacity is given
+        self.replay_buffer = ReplayBuffer(replay_capacity) if replay_capacity else None
+        
         self.current_state = None
         self.last_action = None
+        
+        # Callables receiving an event dict for every learned transition
+        self.listeners = []
+    
+    def add_listener(self, callback):
+        """Register a callback for live transition events (e.g. a JsonlEventSink)"""
+        self.listeners.append(callback)
     
     def process_logs(self, log_lines):
         """Process new log lines and update current state"""
         self.current_state = self.state_mapper.extract_state_from_logs(log_lines)
         return self.current_state
     
+    def stream_logs(self, log_path=None, batch_size=1000, follow=True, poll_interval=0.5):
+        """Follow the spec's log_location like `tail -F`, yielding a new state per batch"""
+        follower = LogFollower(log_path or self.app_spec['log_location'], poll_interval=poll_interval)
+        for batch in follower.batches(batch_size, follow=follow):
+            yield self.process_logs(batch)
+    
     def choose_action(self, state=None):
         """Choose action using epsilon-greedy policy"""
         if state is None:
@@ -41,13 +74,18 @@ class UniversalRLAgent:
         state_key = self._state_to_key(state)
         
         # Epsilon-greedy action selection
-        if random.random() < self.epsilon or state_key not in self.q_table:
+        action = None
+        if random.random() >= self.epsilon:
+            # Choose action with highest Q-value (None if the state is unseen)
+            valid_mask = self.action_space.get_valid_mask(state)
+            action = self.q_table.best_action_masked(state_key, valid_mask)
+            if action is None and self.shared_q_table is not None:
+                # Unseen here: start from what other apps learned for this state
+                index = self.shared_q_table.best_action_index(state_key, self.action_codes, valid_mask)
+                if index >= 0:
+                    action = self.action_space.action_names[index]
+        if action is None:
             action = random.choice(valid_actions)
-        else:
-            # Choose action with highest Q-value
-            q_values = self.q_table[state_key]
-            valid_q_values = {a: q_values.get(a, 0) for a in valid_actions}
-            action = max(valid_q_values, key=valid_q_values.get)
         
         self.last_action = action
         return action
@@ -56,65 +94,105 @@ class UniversalRLAgent:
         """Execute chosen action"""
         return self.action_space.execute_action(action_name, dry_run)
     
+    def execute_action_async(self, action_name, dry_run=True, timeout=None):
+        """Execute chosen action in the background, returning a Future"""
+        return self.action_space.execute_action_async(action_name, dry_run, timeout)
+    
     def update_q_value(self, reward, next_state=None):
         """Update Q-value based on reward"""
         if self.current_state is None or self.last_action is None:
             return
         
         state_key = self._state_to_key(self.current_state)
+        next_state_key = self._state_to_key(next_state) if next_state else None
         
-        if state_key not in self.q_table:
-            self.q_table[state_key] = {}
+        # Q-learning update
+        self.q_table.update(state_key, self.last_action, reward, next_state_key,
+                            self.learning_rate, self.discount_factor)
         
-        current_q = self.q_table[state_key].get(self.last_action, 0)
+        if self.shared_q_table is not None:
+            code = self.action_codes[self.q_table.action_index[self.last_action]]
+            if code >= 0:
+                self.shared_q_table.update(state_key, code, reward, next_state_key,
+                                           self.learning_rate, self.discount_factor)
         
-        if next_state:
-            next_state_key = self._state_to_key(next_state)
-            next_max_q = 0
-            if next_state_key in self.q_table:
-                next_max_q = max(self.q_table[next_state_key].values()) if self.q_table[next_state_key] else 0
-        else:
-            next_max_q = 0
+        if self.replay_buffer is not None:
+            next_row = self.q_table.row(next_state_key, create=True) if next_state_key else -1
+            self.replay_buffer.add(self.q_table.row(state_key),
+                                   self.q_table.action_index[self.last_action],
+                                   reward, next_row)
         
-        # Q-learning update
-        new_q = current_q + self.learning_rate * (reward + self.discount_factor * next_max_q - current_q)
-        self.q_table[state_key][self.last_action] = new_q
+        if self.listeners:
+            event = transition_event(self.app_spec['name'], self.current_state, self.last_action, reward)
+            for listener in self.listeners:
+                listener(event)
+    
+    def train_batch(self, batch_size=256, batches=1):
+        """Replay sampled minibatches of recorded transitions as vectorized Q-learning updates"""
+        if not self.replay_buffer:
+            return 0
+        
+        updated = 0
+        for _ in range(batches):
+            states, actions, rewards, next_states = self.replay_buffer.sample(batch_size)
+            updated += self.q_table.update_batch(states, actions, rewards, next_states,
+                                                 self.learning_rate, self.discount_factor)
+        return updated
     
     def _state_to_key(self, state):
-        """Convert state dict to string key for Q-table"""
-        return f"{state['status']}_{state['env']}_{state['error_count']}_{state['error_severity']}"
+        """Convert state dict to a discretized Q-table key"""
+        return make_state_key(state)
     
     def get_policy_summary(self):
         """Get current policy summary"""
         return {
             "app_name": self.app_spec['name'],
-            "q_table_size": len(self.q_table),
+            "q_table_size": self.q_table.visited_states,
             "available_actions": self.action_space.action_names,
             "current_state": self.current_state,
             "epsilon": self.epsilon
         }
     
-    def save_policy(self, filepath):
-        """Save current policy to file"""
+    def save_policy(self, filepath, format=None):
+        """Save current policy to file (binary by default, JSON for .json paths)"""
+        if format is None:
+            format = 'json' if filepath.endswith('.json') else 'binary'
+        
+        hyperparameters = {
+            "learning_rate": self.learning_rate,
+            "discount_factor": self.discount_factor,
+            "epsilon": self.epsilon
+        }
+        
+        if format == 'binary':
+            save_binary_policy(filepath, self.q_table, {
+                "app_spec": self.app_spec,
+                "hyperparameters": hyperparameters
+            })
+            return
+        
         policy_data = {
             "app_spec": self.app_spec,
-            "q_table": self.q_table,
-            "hyperparameters": {
-                "learning_rate": self.learning_rate,
-                "discount_factor": self.discount_factor,
-                "epsilon": self.epsilon
-            }
+            "q_table": self.q_table.to_dict(),
+            "hyperparameters": hyperparameters
         }
         
         with open(filepath, 'w') as f:
             json.dump(policy_data, f, indent=2)
     
     def load_policy(self, filepath):
-        """Load policy from file"""
-        with open(filepath, 'r') as f:
-            policy_data = json.load(f)
+        """Load policy from file, memory-mapping binary policies"""
+        if is_binary_policy(filepath):
+            q_table, policy_data = load_binary_policy(filepath)
+            if q_table.action_names == self.action_space.action_names:
+                self.q_table = q_table
+            else:
+                self.q_table = ArrayQTable.from_dict(q_table.to_dict(), self.action_space.action_names)
+        else:
+            with open(filepath, 'r') as f:
+                policy_data = json.load(f)
+            self.q_table = ArrayQTable.from_dict(policy_data.get('q_table', {}), self.action_space.action_names)
         
-        self.q_table = policy_data.get('q_table', {})
         hyperparams = policy_data.get('hyperparameters', {})
         self.learning_rate = hyperparams.get('learning_rate', 0.1)
         self.discount_factor = hyperparams.get('discount_factor', 0.9)